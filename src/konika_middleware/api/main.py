@@ -7,7 +7,8 @@ from typing import Dict, Any
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from ..models.config import Config
 from ..core.device_manager import DeviceManager
@@ -15,6 +16,12 @@ from ..core.remote_client import RemoteClient
 from ..core.exceptions import MiddlewareError
 from .routers import devices, jobs, health, remote
 
+try:
+    import orjson  # noqa: F401  (needed by ORJSONResponse)
+    _DefaultResponse = ORJSONResponse
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    _DefaultResponse = JSONResponse
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -83,7 +90,9 @@ app = FastAPI(
     title="Konica Minolta Printer Middleware",
     description="Middleware API for integrating Konica Minolta printers with external platforms",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Render response bodies (e.g. large job lists) with orjson when it is installed
+    default_response_class=_DefaultResponse
 )
 
 # Add CORS middleware
@@ -95,6 +104,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (job and device lists) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(health.router, prefix="/api/v1")
 app.include_router(devices.router, prefix="/api/v1")
@@ -166,7 +166,7 @@ async def remove_device(
     device_manager=Depends(get_device_manager)
 ) -> Dict[str, str]:
     """Remove a device from the manager."""
-    if device_manager.remove_device(device_id):
+    if await device_manager.remove_device(device_id):
         return {"message": f"Device {device_id} removed successfully"}
     else:
         raise HTTPException(status_code=404, detail=f"Device not found: {device_id}")
\ No newline at end of file
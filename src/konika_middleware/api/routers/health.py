@@ -6,7 +6,7 @@ from fastapi import APIRouter, Request
 router = APIRouter(tags=["health"])
 
 
-@router.get("/health")
+@router.api_route("/health", methods=["GET", "HEAD"])
 async def health_check() -> Dict[str, str]:
     """Basic health check endpoint."""
     return {"status": "healthy", "service": "konika-minolta-middleware"}
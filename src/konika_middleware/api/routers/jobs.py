@@ -77,7 +77,7 @@ async def submit_print_job(
         job = PrintJob(
             id=job_id,
             title=title,
-            status=JobStatus.PENDING,
+            status=JobStatus.PENDING.value,
             user_id=user_id,
             platform_job_id=platform_job_id,
             file_path=f"/tmp/{job_id}_{file.filename}",  # Placeholder
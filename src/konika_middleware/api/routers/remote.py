@@ -3,11 +3,11 @@
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, Request, HTTPException, Depends, Body, Header
 from pydantic import BaseModel
-import hashlib
 import hmac
 import time
 
 from ...core.exceptions import MiddlewareError
+from ...core.remote_client import SIGNATURE_ALGORITHMS
 
 
 router = APIRouter(prefix="/remote", tags=["remote"])
@@ -35,7 +35,8 @@ def verify_api_key(x_api_key: Optional[str] = Header(None)):
 def verify_signature(
     request: Request,
     x_signature: Optional[str] = Header(None),
-    x_timestamp: Optional[str] = Header(None)
+    x_timestamp: Optional[str] = Header(None),
+    x_signature_alg: str = Header('sha256')
 ):
     """Verify HMAC signature for secure communication."""
     import os
@@ -56,6 +57,10 @@ def verify_signature(
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid timestamp")
     
+    digestmod = SIGNATURE_ALGORITHMS.get(x_signature_alg.lower())
+    if digestmod is None:
+        raise HTTPException(status_code=401, detail="Unsupported signature algorithm")
+    
     # Verify signature
     # Note: In a real implementation, you'd need to reconstruct the exact string that was signed
     # This is a simplified example
@@ -64,7 +69,7 @@ def verify_signature(
     expected_signature = hmac.new(
         secret_key.encode(),
         string_to_sign.encode(),
-        hashlib.sha256
+        digestmod
     ).hexdigest()
     
     if not hmac.compare_digest(x_signature, expected_signature):
@@ -5,7 +5,7 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
-from ..models.device import Device, DeviceStatus, DeviceType, DeviceStatusResponse
+from ..models.device import Device, DeviceStatus, DeviceStatusResponse
 from ..models.config import Settings
 from .exceptions import DeviceNotFoundError, DeviceConnectionError
 from .discovery import NetworkDiscovery
@@ -23,7 +23,11 @@ class DeviceManager:
         self._device_adapters: Dict[str, any] = {}  # Will hold device-specific adapters
         self._status_check_interval = 30  # seconds
         self._status_check_task: Optional[asyncio.Task] = None
-        self._discovery = NetworkDiscovery(settings.snmp_community)
+        self._discovery = NetworkDiscovery(
+            settings.snmp_community,
+            settings.discovery_concurrency,
+            settings.discovery_max_probes
+        )
         
         # Initialize devices (now empty, will be populated by discovery)
         self._initialize_devices()
@@ -56,6 +60,11 @@ class DeviceManager:
                 await self._status_check_task
             except asyncio.CancelledError:
                 pass
+        
+        # Close adapter sessions
+        adapters = list(self._device_adapters.values())
+        self._device_adapters.clear()
+        await asyncio.gather(*(adapter.close() for adapter in adapters), return_exceptions=True)
     
     async def _periodic_status_check(self) -> None:
         """Periodically check status of all devices."""
@@ -160,24 +169,13 @@ class DeviceManager:
         """Get or create device adapter for specific device type."""
         if device.id not in self._device_adapters:
             # Import and create adapter based on device type
-            if device.type == DeviceType.C654E:
-                from ..devices.km_c654e import KMC654eAdapter
-                adapter = KMC654eAdapter(device, self.settings)
-            elif device.type == DeviceType.C759:
-                # C759 typically has Fiery controller
-                from ..devices.fiery_adapter import FieryDeviceAdapter
-                adapter = FieryDeviceAdapter(device, self.settings)
-            elif device.type == DeviceType.C754E:
-                # C754e typically has Fiery controller
-                from ..devices.fiery_adapter import FieryDeviceAdapter
-                adapter = FieryDeviceAdapter(device, self.settings)
-            elif device.type == DeviceType.KM2100:
-                from ..devices.km_2100 import KM2100Adapter
-                adapter = KM2100Adapter(device, self.settings)
-            else:
+            from ..devices import ADAPTER_BY_TYPE
+            
+            adapter_class = ADAPTER_BY_TYPE.get(device.type)
+            if adapter_class is None:
                 raise ValueError(f"Unsupported device type: {device.type}")
             
-            self._device_adapters[device.id] = adapter
+            self._device_adapters[device.id] = adapter_class(device, self.settings)
         
         return self._device_adapters[device.id]
     
@@ -209,7 +207,10 @@ class DeviceManager:
         try:
             from ..devices.snmp_client import SNMPClient
             snmp = SNMPClient(device.ip_address, self.settings.snmp_community)
-            device_info = await snmp.get_device_info()
+            try:
+                device_info = await snmp.get_device_info()
+            finally:
+                snmp.close()
             result["tests"]["snmp_connectivity"] = {
                 "status": "pass",
                 "message": f"SNMP working, device: {device_info.get('description', 'Unknown')}"
@@ -370,12 +371,13 @@ class DeviceManager:
         self._devices[device.id] = device
         logger.info(f"Manually added device: {device.name} ({device.id}) at {device.ip_address}")
     
-    def remove_device(self, device_id: str) -> bool:
+    async def remove_device(self, device_id: str) -> bool:
         """Remove a device from the manager."""
         if device_id in self._devices:
             device = self._devices.pop(device_id)
             if device_id in self._device_adapters:
-                self._device_adapters.pop(device_id)
+                adapter = self._device_adapters.pop(device_id)
+                await adapter.close()
             logger.info(f"Removed device: {device.name} ({device_id})")
             return True
         return False
@@ -16,6 +16,15 @@ from ..models.device import Device, DeviceType
 
 logger = logging.getLogger(__name__)
 
+# TCP ports tried when sweeping a range for live hosts; any printer listens on at least one
+_PROBE_PORTS = (80, 443, 9100)
+
+# Per-port connect timeout for the liveness sweep (LAN round trips are well under this)
+_PROBE_TIMEOUT = 0.3
+
+# SNMP timeout (seconds) when asking a candidate host who it is; printers answer well within this
+_SNMP_PROBE_TIMEOUT = 1
+
 
 class NetworkDiscovery:
     """Discovers Konica Minolta devices on the network."""
@@ -51,8 +60,12 @@ class NetworkDiscovery:
         "60-55C-KM"
     ]
     
-    def __init__(self, snmp_community: str = "public"):
+    def __init__(self, snmp_community: str = "public", max_concurrency: int = 32, max_probes: int = 60):
         self.snmp_community = snmp_community
+        # Caps in-flight host scans so sockets and file descriptors stay bounded on large ranges
+        self.max_concurrency = max(1, max_concurrency)
+        # Caps in-flight TCP liveness probes during a range sweep
+        self.max_probes = max(1, max_probes)
         self.discovered_devices: List[Dict[str, Any]] = []
         
     async def discover_network_range(self, network: str = None) -> List[Dict[str, Any]]:
@@ -62,18 +75,18 @@ class NetworkDiscovery:
         
         logger.info(f"Starting device discovery on network: {network}")
         
-        # Get all IPs in the range
-        ip_range = list(ipaddress.IPv4Network(network, strict=False))
+        # Usable host addresses only (no network or broadcast address)
+        hosts = [str(ip) for ip in ipaddress.IPv4Network(network, strict=False).hosts()]
         
-        # Scan for devices in parallel
-        tasks = []
-        semaphore = asyncio.Semaphore(50)  # Limit concurrent scans
+        # Sweep the range with cheap TCP connects so the slow SNMP/HTTP scan only runs on live hosts
+        probe_semaphore = asyncio.Semaphore(self.max_probes)
+        alive = await asyncio.gather(*(self._tcp_alive(ip, probe_semaphore) for ip in hosts))
+        live_hosts = [ip for ip, up in zip(hosts, alive) if up]
+        logger.info(f"{len(live_hosts)}/{len(hosts)} hosts answered the TCP probe")
         
-        for ip in ip_range:
-            if str(ip).endswith('.0') or str(ip).endswith('.255'):
-                continue  # Skip network and broadcast addresses
-            task = self._scan_device(str(ip), semaphore)
-            tasks.append(task)
+        # Scan for devices in parallel
+        semaphore = asyncio.Semaphore(self.max_concurrency)  # Limit concurrent scans
+        tasks = [self._scan_device(ip, semaphore) for ip in live_hosts]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
@@ -111,6 +124,24 @@ class NetworkDiscovery:
         # Fallback to common network ranges
         return "192.168.0.0/24"
     
+    async def _tcp_alive(self, ip: str, semaphore: asyncio.Semaphore) -> bool:
+        """Return True if the host accepts or actively refuses a TCP connection on a probe port."""
+        async with semaphore:
+            for port in _PROBE_PORTS:
+                try:
+                    _, writer = await asyncio.wait_for(
+                        asyncio.open_connection(ip, port),
+                        timeout=_PROBE_TIMEOUT
+                    )
+                except ConnectionRefusedError:
+                    # A reset still proves something is at this address
+                    return True
+                except (asyncio.TimeoutError, OSError):
+                    continue
+                writer.close()
+                return True
+            return False
+    
     async def _scan_device(self, ip: str, semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
         """Scan a single IP for KM device."""
         async with semaphore:
@@ -191,13 +222,15 @@ class NetworkDiscovery:
     
     async def _snmp_discovery(self, ip: str) -> Optional[Dict[str, Any]]:
         """Try SNMP discovery on device."""
+        snmp_client = SNMPClient(ip, self.snmp_community, timeout=_SNMP_PROBE_TIMEOUT, retries=1)
         try:
-            snmp_client = SNMPClient(ip, self.snmp_community)
             device_info = await snmp_client.get_device_info()
             return device_info
         except Exception as e:
             logger.debug(f"SNMP discovery failed for {ip}: {e}")
             return None
+        finally:
+            snmp_client.close()
     
     async def _http_discovery(self, ip: str) -> Optional[Dict[str, Any]]:
         """Try HTTP discovery on device."""
@@ -231,8 +264,8 @@ class NetworkDiscovery:
         """Try Fiery controller discovery on device."""
         try:
             from ..devices.fiery_client import FieryClient
-            fiery_client = FieryClient(ip)
-            detection_result = await fiery_client.detect_fiery()
+            async with FieryClient(ip) as fiery_client:
+                detection_result = await fiery_client.detect_fiery()
             return detection_result
         except Exception as e:
             logger.debug(f"Fiery discovery failed for {ip}: {e}")
@@ -489,7 +522,7 @@ class NetworkDiscovery:
         logger.info(f"Quick scanning {len(ip_list)} IP addresses")
         
         tasks = []
-        semaphore = asyncio.Semaphore(20)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
         
         for ip in ip_list:
             task = self._scan_device(ip, semaphore)
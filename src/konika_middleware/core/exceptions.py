@@ -26,6 +26,16 @@ class DeviceConnectionError(DeviceError):
         super().__init__(message, device_id, "DEVICE_CONNECTION_ERROR", details)
 
 
+class CircuitOpenError(DeviceConnectionError):
+    """Exception when calls to a device are short-circuited after repeated failures."""
+    
+    def __init__(self, host: str, retry_after: float = None):
+        super().__init__(f"Circuit open for {host}, skipping request", details={"retry_after": retry_after})
+        self.error_code = "CIRCUIT_OPEN"
+        self.host = host
+        self.retry_after = retry_after
+
+
 class DeviceAuthenticationError(DeviceError):
     """Exception for device authentication errors."""
     
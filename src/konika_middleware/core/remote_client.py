@@ -3,17 +3,48 @@
 import asyncio
 import aiohttp
 import logging
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Set, Callable, Tuple
 from datetime import datetime, timedelta
 import json
+import functools
 import hashlib
 import hmac
+import re
 
 from ..models.config import Settings
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
 
 logger = logging.getLogger(__name__)
 
+# Comma/whitespace separated endpoint URLs in WEBHOOK_ENDPOINTS / POLLING_ENDPOINTS
+_ENDPOINT_RE = re.compile(r'[^,\s]+')
+
+# Shared (sync, async) sentinel for events without registered handlers
+_EMPTY_HANDLERS: Tuple[Tuple[Callable, ...], Tuple[Callable, ...]] = ((), ())
+
+# Shared request timeouts (ClientTimeout is immutable and safe to reuse)
+_POLL_TIMEOUT = aiohttp.ClientTimeout(total=10)
+_HC_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# HMAC digest constructors selectable via the X-Signature-Alg header
+SIGNATURE_ALGORITHMS: Dict[str, Callable] = {
+    'sha256': hashlib.sha256,
+    'blake2b': functools.partial(hashlib.blake2b, digest_size=32),
+}
+
+# Remote command type -> internal event name
+_CMD_TO_EVENT: Dict[str, str] = {
+    'discover_devices': 'discover_devices_requested',
+    'get_device_status': 'device_status_requested',
+    'restart_service': 'restart_requested',
+}
+
 
 class RemoteClient:
     """Handles communication with remote servers (webhooks, polling, etc.)."""
@@ -22,22 +53,30 @@ class RemoteClient:
         self.settings = settings
         self.webhook_endpoints: List[str] = []
         self.polling_endpoints: List[str] = []
+        # Shadow sets for O(1) dedupe; the lists keep registration order
+        self._webhook_set: Set[str] = set()
+        self._polling_set: Set[str] = set()
         self.api_key: Optional[str] = None
         self.secret_key: Optional[str] = None
+        self.signature_alg = 'blake2b' if settings.use_blake2 else 'sha256'
+        self._hasher = SIGNATURE_ALGORITHMS[self.signature_alg]
         
-        # Event handlers
-        self.event_handlers: Dict[str, List[Callable]] = {
-            'device_discovered': [],
-            'device_status_changed': [],
-            'job_completed': [],
-            'job_failed': [],
-            'system_started': [],
-            'system_error': []
+        # Event handlers, split into (sync, async) lists at registration time
+        self.event_handlers: Dict[str, Tuple[List[Callable], List[Callable]]] = {
+            'device_discovered': ([], []),
+            'device_status_changed': ([], []),
+            'job_completed': ([], []),
+            'job_failed': ([], []),
+            'system_started': ([], []),
+            'system_error': ([], [])
         }
         
         # Polling settings
         self.polling_interval = 30  # seconds
         self.polling_task: Optional[asyncio.Task] = None
+        self.max_poll_workers = 8
+        self._poll_queue: Optional[asyncio.Queue] = None
+        self._poll_workers: List[asyncio.Task] = []
         
         # Load configuration
         self._load_remote_config()
@@ -47,11 +86,10 @@ class RemoteClient:
         # These would come from environment variables
         import os
         
-        self.webhook_endpoints = os.getenv('WEBHOOK_ENDPOINTS', '').split(',')
-        self.webhook_endpoints = [url.strip() for url in self.webhook_endpoints if url.strip()]
-        
-        self.polling_endpoints = os.getenv('POLLING_ENDPOINTS', '').split(',')
-        self.polling_endpoints = [url.strip() for url in self.polling_endpoints if url.strip()]
+        self.webhook_endpoints = list(dict.fromkeys(_ENDPOINT_RE.findall(os.getenv('WEBHOOK_ENDPOINTS', ''))))
+        self.polling_endpoints = list(dict.fromkeys(_ENDPOINT_RE.findall(os.getenv('POLLING_ENDPOINTS', ''))))
+        self._webhook_set = set(self.webhook_endpoints)
+        self._polling_set = set(self.polling_endpoints)
         
         self.api_key = os.getenv('REMOTE_API_KEY')
         self.secret_key = os.getenv('REMOTE_SECRET_KEY')
@@ -60,15 +98,19 @@ class RemoteClient:
     
     def add_webhook(self, url: str) -> None:
         """Add a webhook endpoint."""
-        if url not in self.webhook_endpoints:
-            self.webhook_endpoints.append(url)
-            logger.info(f"Added webhook endpoint: {url}")
+        if url in self._webhook_set:
+            return
+        self._webhook_set.add(url)
+        self.webhook_endpoints.append(url)
+        logger.info(f"Added webhook endpoint: {url}")
     
     def add_polling_endpoint(self, url: str) -> None:
         """Add a polling endpoint."""
-        if url not in self.polling_endpoints:
-            self.polling_endpoints.append(url)
-            logger.info(f"Added polling endpoint: {url}")
+        if url in self._polling_set:
+            return
+        self._polling_set.add(url)
+        self.polling_endpoints.append(url)
+        logger.info(f"Added polling endpoint: {url}")
     
     def set_credentials(self, api_key: str, secret_key: Optional[str] = None) -> None:
         """Set API credentials for remote communication."""
@@ -82,7 +124,19 @@ class RemoteClient:
             logger.info("No polling endpoints configured")
             return
         
+        if self.polling_task and not self.polling_task.done():
+            logger.info("Remote polling already running")
+            return
+        
         logger.info("Starting remote polling...")
+        
+        # Endpoints are queued once per tick and drained by a small worker pool,
+        # so signing and requests are spread out instead of fired all at once
+        self._poll_queue = asyncio.Queue(maxsize=len(self.polling_endpoints))
+        self._poll_workers = [
+            asyncio.create_task(self._poll_worker())
+            for _ in range(min(self.max_poll_workers, len(self.polling_endpoints)))
+        ]
         self.polling_task = asyncio.create_task(self._polling_loop())
     
     async def stop_polling(self) -> None:
@@ -93,6 +147,15 @@ class RemoteClient:
                 await self.polling_task
             except asyncio.CancelledError:
                 pass
+        
+        for worker in self._poll_workers:
+            worker.cancel()
+        if self._poll_workers:
+            await asyncio.gather(*self._poll_workers, return_exceptions=True)
+        self._poll_workers = []
+        self._poll_queue = None
+        
+        if self.polling_task:
             logger.info("Remote polling stopped")
     
     async def _polling_loop(self) -> None:
@@ -108,20 +171,33 @@ class RemoteClient:
     
     async def _poll_all_endpoints(self) -> None:
         """Poll all configured endpoints."""
-        tasks = [self._poll_endpoint(url) for url in self.polling_endpoints]
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._poll_queue is None:
+            return
+        
+        for url in list(self.polling_endpoints):
+            await self._poll_queue.put(url)
+        await self._poll_queue.join()
+    
+    async def _poll_worker(self) -> None:
+        """Consume endpoint URLs from the polling queue."""
+        while True:
+            url = await self._poll_queue.get()
+            try:
+                await self._poll_endpoint(url)
+            finally:
+                self._poll_queue.task_done()
     
     async def _poll_endpoint(self, url: str) -> None:
         """Poll a single endpoint for new jobs/commands."""
         try:
             headers = self._create_auth_headers('GET', url)
             
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with aiohttp.ClientSession(timeout=_POLL_TIMEOUT) as session:
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        if response.headers.get('Content-Length') == '0':
+                            return
+                        data = await response.json(loads=_json_loads)
                         await self._process_polling_response(url, data)
                     elif response.status != 204:  # 204 = no content (no jobs)
                         logger.warning(f"Polling endpoint {url} returned status {response.status}")
@@ -165,12 +241,9 @@ class RemoteClient:
                 cmd_type = command.get('type')
                 cmd_data = command.get('data', {})
                 
-                if cmd_type == 'discover_devices':
-                    await self._trigger_event('discover_devices_requested', cmd_data)
-                elif cmd_type == 'get_device_status':
-                    await self._trigger_event('device_status_requested', cmd_data)
-                elif cmd_type == 'restart_service':
-                    await self._trigger_event('restart_requested', cmd_data)
+                event_type = _CMD_TO_EVENT.get(cmd_type)
+                if event_type:
+                    await self._trigger_event(event_type, cmd_data)
                 
                 logger.info(f"Processed remote command: {cmd_type}")
                 
@@ -205,8 +278,7 @@ class RemoteClient:
             headers = self._create_auth_headers('POST', url, json.dumps(data))
             headers['Content-Type'] = 'application/json'
             
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with aiohttp.ClientSession(timeout=_POLL_TIMEOUT) as session:
                 async with session.post(url, json=data, headers=headers) as response:
                     if response.status in [200, 201, 202]:
                         logger.debug(f"Webhook sent successfully to {url}")
@@ -231,34 +303,47 @@ class RemoteClient:
             signature = hmac.new(
                 self.secret_key.encode(),
                 string_to_sign.encode(),
-                hashlib.sha256
+                self._hasher
             ).hexdigest()
             
             headers['X-Timestamp'] = timestamp
             headers['X-Signature'] = signature
+            if self.signature_alg != 'sha256':
+                headers['X-Signature-Alg'] = self.signature_alg
         
         return headers
     
     def register_event_handler(self, event_type: str, handler: Callable) -> None:
-        """Register an event handler."""
-        if event_type not in self.event_handlers:
-            self.event_handlers[event_type] = []
+        """Register an event handler.
         
-        self.event_handlers[event_type].append(handler)
+        Sync handlers run in registration order before any async handler; async
+        handlers then run concurrently, so no order holds between them.
+        """
+        sync_handlers, async_handlers = self.event_handlers.setdefault(event_type, ([], []))
+        if asyncio.iscoroutinefunction(handler):
+            async_handlers.append(handler)
+        else:
+            sync_handlers.append(handler)
         logger.debug(f"Registered handler for event: {event_type}")
     
     async def _trigger_event(self, event_type: str, data: Dict[str, Any]) -> None:
-        """Trigger event handlers."""
-        handlers = self.event_handlers.get(event_type, [])
+        """Trigger event handlers: sync ones in order, then all async ones together."""
+        sync_handlers, async_handlers = self.event_handlers.get(event_type, _EMPTY_HANDLERS)
         
-        for handler in handlers:
+        for handler in sync_handlers:
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(data)
-                else:
-                    handler(data)
+                handler(data)
             except Exception as e:
                 logger.error(f"Error in event handler for {event_type}: {e}")
+        
+        if async_handlers:
+            results = await asyncio.gather(
+                *(handler(data) for handler in async_handlers),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.error(f"Error in event handler for {event_type}: {result}")
     
     # Public methods for triggering events
     async def notify_device_discovered(self, device_data: Dict[str, Any]) -> None:
@@ -329,8 +414,7 @@ class RemoteClient:
         # Test webhook endpoints
         for url in self.webhook_endpoints:
             try:
-                timeout = aiohttp.ClientTimeout(total=5)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with aiohttp.ClientSession(timeout=_HC_TIMEOUT) as session:
                     async with session.get(url) as response:
                         results['webhooks'][url] = {
                             'status': 'reachable',
@@ -346,8 +430,7 @@ class RemoteClient:
         for url in self.polling_endpoints:
             try:
                 headers = self._create_auth_headers('GET', url)
-                timeout = aiohttp.ClientTimeout(total=5)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with aiohttp.ClientSession(timeout=_HC_TIMEOUT) as session:
                     async with session.get(url, headers=headers) as response:
                         results['polling_endpoints'][url] = {
                             'status': 'reachable',
@@ -1 +1,27 @@
-"""Device adapters for different Konica Minolta printer models."""
\ No newline at end of file
+"""Device adapters for different Konica Minolta printer models."""
+
+from typing import Dict, Type
+
+from .base_adapter import BaseDeviceAdapter
+from .fiery_adapter import FieryDeviceAdapter
+from .km_2100 import KM2100Adapter
+from .km_c654e import KMC654eAdapter
+from ..models.device import DeviceType
+
+# Adapter class per device type. DeviceType is a str enum, so both members and
+# their raw values (devices are stored with use_enum_values) hash to the same key.
+ADAPTER_BY_TYPE: Dict[str, Type[BaseDeviceAdapter]] = {
+    DeviceType.C654E: KMC654eAdapter,
+    # C759 and C754e typically have Fiery controllers
+    DeviceType.C759: FieryDeviceAdapter,
+    DeviceType.C754E: FieryDeviceAdapter,
+    DeviceType.KM2100: KM2100Adapter,
+}
+
+__all__ = [
+    "ADAPTER_BY_TYPE",
+    "BaseDeviceAdapter",
+    "FieryDeviceAdapter",
+    "KM2100Adapter",
+    "KMC654eAdapter",
+]
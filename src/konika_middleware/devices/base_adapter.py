@@ -1,8 +1,10 @@
 """Base adapter class for all device types."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional, BinaryIO
+import asyncio
 import logging
+import socket
 
 from ..models.device import Device
 from ..models.job import PrintJob, PrintSettings
@@ -11,6 +13,12 @@ from ..models.config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Read size when a print file has to be copied to the socket by hand
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Kernel send buffer requested for print data connections
+STREAM_SNDBUF_SIZE = 1 << 20
+
 
 class BaseDeviceAdapter(ABC):
     """Base class for all device adapters."""
@@ -36,8 +44,11 @@ class BaseDeviceAdapter(ABC):
         pass
     
     @abstractmethod
-    async def get_capabilities(self) -> Dict[str, Any]:
-        """Get device capabilities and supported features."""
+    async def get_capabilities(self) -> Mapping[str, Any]:
+        """Get device capabilities and supported features.
+        
+        May be a shared read-only mapping; copy it before modifying.
+        """
         pass
     
     @abstractmethod
@@ -65,10 +76,50 @@ class BaseDeviceAdapter(ABC):
             "jobs": []
         }
     
+    async def close(self) -> None:
+        """Release network resources held by the adapter. Default implementation does nothing."""
+        pass
+    
+    async def _stream_file(self, writer: asyncio.StreamWriter, f: BinaryIO) -> int:
+        """Send an open file over a stream connection and return the number of bytes sent.
+        
+        Uses the event loop's sendfile() (zero-copy where the OS supports it) and
+        falls back to chunked reads off the event loop when the loop lacks it.
+        """
+        loop = asyncio.get_running_loop()
+        
+        # Ship the tail of the job immediately and let the kernel queue large bursts
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, STREAM_SNDBUF_SIZE)
+            except OSError as e:
+                self.logger.debug(f"Could not tune print socket: {e}")
+        
+        await writer.drain()
+        
+        try:
+            return await loop.sendfile(writer.transport, f)
+        except NotImplementedError:
+            pass
+        
+        bytes_sent = 0
+        while True:
+            chunk = await loop.run_in_executor(None, f.read, STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+            bytes_sent += len(chunk)
+        return bytes_sent
+    
     def _log_operation(self, operation: str, **kwargs):
         """Log device operations for debugging."""
-        details = " ".join([f"{k}={v}" for k, v in kwargs.items()])
-        self.logger.info(f"{operation} - {details}")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        details = " ".join(f"{k}={v}" for k, v in kwargs.items())
+        self.logger.info("%s - %s", operation, details)
     
     def _handle_error(self, operation: str, error: Exception) -> Dict[str, Any]:
         """Standard error handling for device operations."""
@@ -112,7 +112,8 @@ class FieryDeviceAdapter(BaseDeviceAdapter):
         self._log_operation("get_capabilities", device=self.device.id)
         
         try:
-            capabilities = await self.fiery_client.get_capabilities()
+            # The client's table is shared and read-only
+            capabilities = dict(await self.fiery_client.get_capabilities())
             
             # Add device-specific capabilities based on model
             if 'C759' in (self.device.name or ''):
@@ -257,4 +258,8 @@ class FieryDeviceAdapter(BaseDeviceAdapter):
                 'current_job': None,
                 'jobs': [],
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+    
+    async def close(self) -> None:
+        """Close the Fiery client's HTTP session."""
+        await self.fiery_client.close()
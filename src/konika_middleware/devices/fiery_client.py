@@ -5,23 +5,345 @@ Handles communication with EFI Fiery controllers on C759, C754e, and other model
 
 import aiohttp
 import asyncio
+import copy
+import functools
 import logging
-from typing import Dict, Any, Optional, List
-import xml.etree.ElementTree as ET
+import os
+import random
+import re
+import time
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Tuple, Awaitable, AsyncIterator, Callable, Mapping
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
+try:
+    from lxml import etree as ET
+    # Controller responses are untrusted: no entity expansion, no network fetches
+    _XML_PARSER = ET.XMLParser(resolve_entities=False, no_network=True)
+    _XMLParseError = ET.XMLSyntaxError
+except ImportError:  # lxml is optional; fall back to the stdlib parser
+    import xml.etree.ElementTree as ET
+    _XML_PARSER = None
+    _XMLParseError = ET.ParseError
+
+from ..core.exceptions import CircuitOpenError
+
+
 logger = logging.getLogger(__name__)
 
+# Patterns and XPaths used when parsing controller responses
+_VERSION_RE = re.compile(r'version\s*[:\s]+([0-9\.]+)', re.IGNORECASE)
+_JOBID_RE = re.compile(r'job[_\s]*id[:\s]*([a-zA-Z0-9\-_]+)', re.IGNORECASE)
+_MODEL_XPATH = './/model'
+_JOBS_XPATH = './/jobs'
+_JOB_XPATH = './/job'
+_FIERY_KEYWORDS = ('fiery', 'efi', 'command workstation')
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker (CLOSED -> OPEN -> HALF_OPEN -> CLOSED)."""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        # Whether the single HALF_OPEN trial request has been handed out and not yet settled
+        self._trial_in_flight = False
+    
+    @property
+    def is_open(self) -> bool:
+        """True while requests should be short-circuited."""
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.recovery_timeout
+    
+    def retry_after(self) -> float:
+        """Seconds until a trial request will be allowed again."""
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+    
+    def allow_request(self) -> bool:
+        """Check whether a request may go out, moving OPEN -> HALF_OPEN after the timeout.
+        
+        HALF_OPEN admits exactly one trial request; everything else is refused until
+        the trial is settled with record_success(), record_failure() or release_trial().
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if self.is_open:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+    
+    def release_trial(self) -> None:
+        """Give back an unsettled HALF_OPEN trial (e.g. the request was cancelled)."""
+        self._trial_in_flight = False
+    
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+# Breakers are shared by every client talking to the same controller
+_breakers: Dict[str, CircuitBreaker] = {}
+
+# Bulkhead semaphores per event loop and controller IP; a semaphore is bound to the
+# loop it is first used on, and weak keys let a finished loop take its semaphores along
+_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]' = weakref.WeakKeyDictionary()
+
+# detect_fiery() results from runs that reached the controller, per IP: (monotonic timestamp, result)
+_detection_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+DETECTION_CACHE_TTL = 300.0  # seconds
+
+# Static controller capabilities; authentication_required is filled in per client
+_FIERY_CAPABILITIES: Dict[str, Any] = {
+    'supports_color': True,
+    'supports_duplex': True,
+    'max_paper_size': 'A3',
+    'supported_formats': ('PDF', 'PS', 'PCL', 'TIFF', 'JPEG'),
+    'fiery_controller': True,
+    'rip_processing': True,
+    'color_management': True,
+    'finishing_options': True,
+}
+
+# Read-only capability tables keyed by authentication_required, shared by all clients
+_FIERY_CAPABILITIES_BY_AUTH: Dict[bool, Mapping[str, Any]] = {
+    auth: MappingProxyType({**_FIERY_CAPABILITIES, 'authentication_required': auth})
+    for auth in (False, True)
+}
+
+
+class _Outcome:
+    """What the requests of one logical client operation saw, settled once on the breaker."""
+    
+    __slots__ = ('reached', 'failed', 'holds_trial')
+    
+    def __init__(self):
+        self.reached = False      # Some request got a response from the controller
+        self.failed = False       # Some request failed to reach it
+        self.holds_trial = False  # Some request was admitted as the HALF_OPEN trial
+
+
+# Outcome of the client operation currently in progress, if any
+_operation: ContextVar[Optional[_Outcome]] = ContextVar('fiery_operation', default=None)
+
+
+def _get_breaker(ip_address: str) -> CircuitBreaker:
+    """Get or create the circuit breaker for a controller."""
+    breaker = _breakers.get(ip_address)
+    if breaker is None:
+        breaker = _breakers[ip_address] = CircuitBreaker()
+    return breaker
+
+
+def _get_semaphore(ip_address: str, limit: int) -> asyncio.Semaphore:
+    """Get or create the running loop's bulkhead semaphore for a controller."""
+    per_ip = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = per_ip.get(ip_address)
+    if semaphore is None:
+        semaphore = per_ip[ip_address] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+# Responses and errors worth retrying; auth failures and other 4xx are final
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class _TransientStatus(Exception):
+    """Raised inside a retried request when the controller answers with a retryable status."""
+    
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+_TRANSIENT_ERRORS = (
+    asyncio.TimeoutError,
+    aiohttp.ServerDisconnectedError,
+    aiohttp.ClientOSError,
+    _TransientStatus,
+)
+
+
+# Absolute time.monotonic() deadline of the operation currently in progress, if any
+_deadline: ContextVar[Optional[float]] = ContextVar('fiery_deadline', default=None)
+
+
+def _remaining(deadline: float) -> float:
+    """Seconds left before ``deadline`` (never negative)."""
+    return max(0.0, deadline - time.monotonic())
+
+
+def _with_deadline(method):
+    """Let a public client method take a ``deadline`` keyword (monotonic seconds).
+    
+    The deadline is stored in a context variable so every request issued
+    underneath it, including hedged and concurrent ones, shares one budget.
+    A nested deadline can only tighten an outer one.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, deadline: Optional[float] = None, **kwargs):
+        if deadline is None:
+            return await method(self, *args, **kwargs)
+        
+        outer = _deadline.get()
+        if outer is not None:
+            deadline = min(deadline, outer)
+        
+        token = _deadline.set(deadline)
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _deadline.reset(token)
+    
+    return wrapper
+
+
+def _breaker_operation(method):
+    """Count a public client method as one success or failure on the circuit breaker.
+    
+    Its parallel, hedged and retried requests all report into one _Outcome, so an
+    offline controller costs one failure per operation rather than one per probe.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if _operation.get() is not None:
+            # Nested inside another operation; the outer one does the accounting
+            return await method(self, *args, **kwargs)
+        
+        outcome = _Outcome()
+        token = _operation.set(outcome)
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _operation.reset(token)
+            self._settle(outcome)
+    
+    return wrapper
+
+
+def _check_transient(response: aiohttp.ClientResponse) -> None:
+    """Raise _TransientStatus for responses that should be retried."""
+    if response.status in _RETRY_STATUSES:
+        raise _TransientStatus(response.status)
+
+
+async def _retry(
+    attempt_factory: Callable[[], Awaitable[Any]],
+    max_attempts: int = 3,
+    base: float = 0.3,
+    cap: float = 5.0
+) -> Any:
+    """Run ``attempt_factory()`` with exponential backoff and full jitter on transient errors."""
+    for attempt in range(max_attempts):
+        try:
+            return await attempt_factory()
+        except _TRANSIENT_ERRORS as e:
+            if attempt == max_attempts - 1:
+                raise
+            delay = min(cap, base * 2 ** attempt) * random.random()
+            deadline = _deadline.get()
+            if deadline is not None and _remaining(deadline) <= delay:
+                raise
+            logger.debug(f"Transient error ({e!r}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+def _parse_xml(data: bytes):
+    """Parse an XML response body with lxml when available, else ElementTree."""
+    return ET.fromstring(data, _XML_PARSER)
+
+
+async def _read_body(response: aiohttp.ClientResponse) -> Tuple[str, Any]:
+    """Read a response body according to its Content-Type.
+    
+    Returns ('json', decoded object), ('xml', raw bytes) or ('text', str).
+    Bodies without a usable Content-Type are sniffed from their first character.
+    """
+    ctype = response.content_type
+    
+    if 'json' in ctype:
+        try:
+            # Both parsers accept bytes, which skips decoding to str first
+            return 'json', _json_loads(await response.read())
+        except ValueError:
+            pass  # Mislabelled body, treat it as text below
+    elif 'xml' in ctype:
+        return 'xml', await response.read()
+    
+    text = await response.text()
+    if 'html' not in ctype:
+        first = text.lstrip()[:1]
+        if first == '{':
+            try:
+                return 'json', _json_loads(text)
+            except ValueError:
+                pass
+        elif first == '<':
+            return 'xml', text.encode()
+    
+    return 'text', text
+
 
 class FieryClient:
     """Client for communicating with EFI Fiery controllers."""
     
+    # (path, marker) pairs whose presence in the page body identifies a Fiery controller
+    FIERY_INDICATORS = (
+        ('/', 'Fiery'),
+        ('/wsi/', 'Fiery Web Services'),
+        ('/status', 'EFI'),
+        ('/info', 'Fiery'),
+        ('/command', 'Command')
+    )
+    # Candidate paths per operation, in order of preference
+    INFO_PATHS = ('/wsi/deviceinfo', '/info', '/status', '/command/deviceinfo')
+    STATUS_PATHS = ('/wsi/status', '/status', '/command/status')
+    AUTH_PATHS = ('/wsi/login', '/command/login', '/api/login')
+    PRINT_PATHS = ('/wsi/print', '/print', '/command/print')
+    
+    # Bulkhead: cap on concurrent in-flight requests per controller; at least the
+    # detect_fiery() fan-out so detection never queues behind itself
+    MAX_CONCURRENT_REQUESTS = max(8, len(FIERY_INDICATORS))
+    
     def __init__(self, ip_address: str, username: str = "admin", password: str = ""):
         self.ip_address = ip_address
         self.username = username
         self.password = password
         self.base_url = f"http://{ip_address}"
-        self.session_cookies = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Outlives individual sessions so a login survives close()/reconnect
+        self._cookie_jar: Optional[aiohttp.CookieJar] = None
+        self._breaker = _get_breaker(ip_address)
+        # Created on first request so it belongs to the loop that uses it
         
         # Common Fiery endpoints
         self.endpoints = {
@@ -39,10 +361,101 @@ class FieryClient:
             'fiery_capabilities': '/wsi/capabilities',
             'fiery_print': '/wsi/print',
         }
+        
+        # Absolute URL for every path this client requests, built once per controller
+        paths = set(self.endpoints.values())
+        paths.update(path for path, _ in self.FIERY_INDICATORS)
+        paths.update(self.INFO_PATHS + self.STATUS_PATHS + self.AUTH_PATHS + self.PRINT_PATHS)
+        self._urls = {path: self.base_url + path for path in paths}
+    
+    async def __aenter__(self) -> "FieryClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            if self._cookie_jar is None:
+                # Controllers are addressed by IP, which the default jar refuses to store cookies for
+                self._cookie_jar = aiohttp.CookieJar(unsafe=True)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    limit_per_host=8,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                ),
+                cookie_jar=self._cookie_jar,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    @asynccontextmanager
+    async def _request(self, method: str, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Issue a request through the controller's circuit breaker and bulkhead."""
+        session = await self._get_session()
+        
+        # Clamp the per-call timeout to whatever is left of the caller's deadline
+        deadline = _deadline.get()
+        if deadline is not None:
+            remaining = _remaining(deadline)
+            if remaining <= 0:
+                raise asyncio.TimeoutError(f"Deadline exceeded before request to {url}")
+            timeout = kwargs.get('timeout') or session.timeout
+            if timeout.total is not None:
+                remaining = min(remaining, timeout.total)
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=remaining)
+        
+        if not self._breaker.allow_request():
+            raise CircuitOpenError(self.ip_address, self._breaker.retry_after())
+        
+        # Outside an operation the request settles on the breaker by itself
+        outcome = _operation.get()
+        standalone = outcome is None
+        if standalone:
+            outcome = _Outcome()
+        if self._breaker.state == CircuitBreaker.HALF_OPEN:
+            outcome.holds_trial = True
+        
+        semaphore = _get_semaphore(self.ip_address, self.MAX_CONCURRENT_REQUESTS)
+        try:
+            async with semaphore:
+                try:
+                    async with session.request(method, url, **kwargs) as response:
+                        outcome.reached = True
+                        yield response
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    outcome.failed = True
+                    raise
+        finally:
+            if standalone:
+                self._settle(outcome)
+    
+    def _settle(self, outcome: _Outcome) -> None:
+        """Record one operation's result on the circuit breaker."""
+        if outcome.reached:
+            self._breaker.record_success()
+        elif outcome.failed:
+            self._breaker.record_failure()
+        elif outcome.holds_trial:
+            # Cancelled or never sent; let the next caller make the trial
+            self._breaker.release_trial()
+    
+    @_with_deadline
+    @_breaker_operation
     async def detect_fiery(self) -> Dict[str, Any]:
         """Detect if this is a Fiery controller and get basic info."""
-        timeout = aiohttp.ClientTimeout(total=10)
+        cached = _detection_cache.get(self.ip_address)
+        if cached is not None and time.monotonic() - cached[0] < DETECTION_CACHE_TTL:
+            return copy.deepcopy(cached[1])
         
         detection_result = {
             'is_fiery': False,
@@ -53,127 +466,207 @@ class FieryClient:
             'error': None
         }
         
+        if self._breaker.is_open:
+            detection_result['error'] = f"Circuit open for {self.ip_address}"
+            return detection_result
+        
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Check common Fiery detection endpoints
-                fiery_indicators = [
-                    ('/', 'Fiery'),
-                    ('/wsi/', 'Fiery Web Services'),
-                    ('/status', 'EFI'),
-                    ('/info', 'Fiery'),
-                    ('/command', 'Command')
-                ]
-                
-                for endpoint, indicator in fiery_indicators:
-                    try:
-                        url = f"{self.base_url}{endpoint}"
-                        async with session.get(url) as response:
-                            if response.status in [200, 301, 302]:
-                                content = await response.text()
-                                if indicator.lower() in content.lower():
-                                    detection_result['is_fiery'] = True
-                                    detection_result['accessible_endpoints'].append(endpoint)
-                                    logger.info(f"Fiery indicator '{indicator}' found at {endpoint}")
-                    except Exception as e:
-                        logger.debug(f"Fiery detection failed for {endpoint}: {e}")
+            # Probe all common Fiery detection endpoints concurrently; results keep the indicator order
+            results = await asyncio.gather(
+                *(self._probe_indicator(endpoint, indicator)
+                  for endpoint, indicator in self.FIERY_INDICATORS),
+                return_exceptions=True
+            )
+            
+            for endpoint in results:
+                if isinstance(endpoint, str):
+                    detection_result['is_fiery'] = True
+                    detection_result['accessible_endpoints'].append(endpoint)
+            
+            # Try to get Fiery version info
+            if detection_result['is_fiery']:
+                await self._get_fiery_info(detection_result)
                 
-                # Try to get Fiery version info
-                if detection_result['is_fiery']:
-                    await self._get_fiery_info(session, detection_result)
-                    
         except Exception as e:
             detection_result['error'] = str(e)
             logger.error(f"Fiery detection failed for {self.ip_address}: {e}")
         
+        # Only trust a result some probe got an answer for; a controller that was
+        # offline or refused by the breaker must be probed again next time
+        outcome = _operation.get()
+        if detection_result['error'] is None and outcome is not None and outcome.reached:
+            _detection_cache[self.ip_address] = (time.monotonic(), copy.deepcopy(detection_result))
+        
         return detection_result
     
-    async def _get_fiery_info(self, session: aiohttp.ClientSession, result: Dict[str, Any]):
+    async def _probe_indicator(self, endpoint: str, indicator: str) -> Optional[str]:
+        """Return the endpoint if its body contains the Fiery indicator."""
+        try:
+            url = self._urls[endpoint]
+            async with self._request('GET', url) as response:
+                if response.status in [200, 301, 302]:
+                    content = await response.text()
+                    if indicator.lower() in content.lower():
+                        logger.info(f"Fiery indicator '{indicator}' found at {endpoint}")
+                        return endpoint
+        except Exception as e:
+            logger.debug(f"Fiery detection failed for {endpoint}: {e}")
+        return None
+    
+    async def _hedged_first(
+        self,
+        coros: List[Awaitable[Optional[Dict[str, Any]]]],
+        hedge_delay: float = 0.3
+    ) -> Optional[Dict[str, Any]]:
+        """Return the first non-None result, hedging the primary request.
+        
+        The first coroutine runs alone; if it has not produced a result after
+        ``hedge_delay`` seconds the remaining ones are started in parallel.
+        """
+        remaining = list(coros)
+        if not remaining:
+            return None
+        
+        pending = {asyncio.ensure_future(remaining.pop(0))}
+        hedged = False
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=None if hedged else hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None and task.result() is not None:
+                        return task.result()
+                
+                if not hedged:
+                    pending.update(asyncio.ensure_future(coro) for coro in remaining)
+                    remaining = []
+                    hedged = True
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            for coro in remaining:
+                coro.close()
+    
+    async def _get_fiery_info(self, result: Dict[str, Any]):
         """Get detailed Fiery information."""
-        info_endpoints = ['/wsi/deviceinfo', '/info', '/status', '/command/deviceinfo']
+        info = await self._hedged_first([self._fetch_info(endpoint) for endpoint in self.INFO_PATHS])
+        if info:
+            result.update(info)
+    
+    async def _fetch_info(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Fetch and parse Fiery information from a single endpoint."""
+        try:
+            url = self._urls[endpoint]
+            async with self._request('GET', url) as response:
+                if response.status != 200:
+                    return None
+                kind, payload = await _read_body(response)
+        except Exception as e:
+            logger.debug(f"Failed to get info from {endpoint}: {e}")
+            return None
         
-        for endpoint in info_endpoints:
+        # Parse XML if it's XML
+        if kind == 'xml':
             try:
-                url = f"{self.base_url}{endpoint}"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        
-                        # Parse XML if it's XML
-                        if content.strip().startswith('<?xml') or content.strip().startswith('<'):
-                            try:
-                                root = ET.fromstring(content)
-                                result['fiery_type'] = 'XML_API'
-                                result['version'] = root.get('version') or 'Unknown'
-                                result['model'] = root.find('.//model')
-                                if result['model'] is not None:
-                                    result['model'] = result['model'].text
-                                break
-                            except ET.ParseError:
-                                pass
-                        
-                        # Parse JSON if it's JSON
-                        elif content.strip().startswith('{'):
-                            try:
-                                data = json.loads(content)
-                                result['fiery_type'] = 'JSON_API'
-                                result['version'] = data.get('version', 'Unknown')
-                                result['model'] = data.get('model', 'Unknown')
-                                break
-                            except json.JSONDecodeError:
-                                pass
-                        
-                        # Look for common Fiery strings
-                        elif any(keyword in content.lower() for keyword in ['fiery', 'efi', 'command workstation']):
-                            result['fiery_type'] = 'Web_Interface'
-                            # Try to extract version from HTML
-                            import re
-                            version_match = re.search(r'version\s*[:\s]+([0-9\.]+)', content, re.IGNORECASE)
-                            if version_match:
-                                result['version'] = version_match.group(1)
-                            break
-                            
-            except Exception as e:
-                logger.debug(f"Failed to get info from {endpoint}: {e}")
+                root = _parse_xml(payload)
+                model = root.find(_MODEL_XPATH)
+                return {
+                    'fiery_type': 'XML_API',
+                    'version': root.get('version') or 'Unknown',
+                    'model': model.text if model is not None else None
+                }
+            except _XMLParseError:
+                return None
+        
+        # Parse JSON if it's JSON
+        elif kind == 'json':
+            if not isinstance(payload, dict):
+                return None
+            return {
+                'fiery_type': 'JSON_API',
+                'version': payload.get('version', 'Unknown'),
+                'model': payload.get('model', 'Unknown')
+            }
+        
+        # Look for common Fiery strings
+        content = payload
+        lower = content.lower()
+        if any(keyword in lower for keyword in _FIERY_KEYWORDS):
+            info = {'fiery_type': 'Web_Interface'}
+            # Try to extract version from HTML
+            version_match = _VERSION_RE.search(content)
+            if version_match:
+                info['version'] = version_match.group(1)
+            return info
+        
+        return None
     
+    @_with_deadline
+    @_breaker_operation
     async def authenticate(self) -> bool:
         """Authenticate with the Fiery controller."""
         if not self.password:
             logger.info("No password provided for Fiery authentication")
             return True  # Some Fiery controllers don't require auth
         
-        timeout = aiohttp.ClientTimeout(total=10)
+        if self._breaker.is_open:
+            logger.warning(f"Skipping Fiery authentication for {self.ip_address}: circuit open")
+            return False
         
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Try different authentication methods
-                auth_methods = [
-                    self._try_basic_auth,
-                    self._try_form_auth,
-                    self._try_fiery_api_auth
-                ]
-                
-                for auth_method in auth_methods:
-                    try:
-                        if await auth_method(session):
-                            logger.info(f"Fiery authentication successful using {auth_method.__name__}")
-                            return True
-                    except Exception as e:
-                        logger.debug(f"Auth method {auth_method.__name__} failed: {e}")
-                
-                logger.warning(f"All Fiery authentication methods failed for {self.ip_address}")
-                return False
-                
+            # Basic and API auth don't touch session state, so race them and
+            # take the first success; form auth sets cookies and runs last on its own
+            if await self._race_auth_methods([self._try_basic_auth, self._try_fiery_api_auth]):
+                return True
+            
+            try:
+                if await self._try_form_auth():
+                    logger.info("Fiery authentication successful using _try_form_auth")
+                    return True
+            except Exception as e:
+                logger.debug(f"Auth method _try_form_auth failed: {e}")
+            
+            logger.warning(f"All Fiery authentication methods failed for {self.ip_address}")
+            return False
+            
         except Exception as e:
             logger.error(f"Fiery authentication error for {self.ip_address}: {e}")
             return False
     
-    async def _try_basic_auth(self, session: aiohttp.ClientSession) -> bool:
+    async def _race_auth_methods(self, auth_methods: List[Callable[[], Awaitable[bool]]]) -> bool:
+        """Run auth methods concurrently; True as soon as one succeeds, cancelling the rest."""
+        tasks = {asyncio.ensure_future(method()): method.__name__ for method in auth_methods}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        logger.debug(f"Auth method {tasks[task]} failed: {task.exception()}")
+                    elif task.result():
+                        logger.info(f"Fiery authentication successful using {tasks[task]}")
+                        return True
+            return False
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _try_basic_auth(self) -> bool:
         """Try HTTP Basic authentication."""
         auth = aiohttp.BasicAuth(self.username, self.password)
-        async with session.get(f"{self.base_url}/status", auth=auth) as response:
-            return response.status in [200, 301, 302]
+        
+        async def attempt() -> bool:
+            async with self._request('GET', self._urls['/status'], auth=auth) as response:
+                _check_transient(response)
+                return response.status in [200, 301, 302]
+        
+        return await _retry(attempt)
     
-    async def _try_form_auth(self, session: aiohttp.ClientSession) -> bool:
+    async def _try_form_auth(self) -> bool:
         """Try form-based authentication."""
         login_data = {
             'username': self.username,
@@ -181,67 +674,62 @@ class FieryClient:
             'login': 'Login'
         }
         
-        async with session.post(f"{self.base_url}/login", data=login_data) as response:
-            if response.status in [200, 301, 302]:
-                # Store session cookies
-                for cookie in session.cookie_jar:
-                    self.session_cookies[cookie.key] = cookie.value
-                return True
-        return False
+        async def attempt() -> bool:
+            async with self._request('POST', self._urls['/login'], data=login_data) as response:
+                _check_transient(response)
+                # Session cookies are kept in the shared session's cookie jar
+                return response.status in [200, 301, 302]
+        
+        return await _retry(attempt)
     
-    async def _try_fiery_api_auth(self, session: aiohttp.ClientSession) -> bool:
+    async def _try_fiery_api_auth(self) -> bool:
         """Try Fiery-specific API authentication."""
         # Some Fiery controllers use specific API endpoints
-        auth_endpoints = ['/wsi/login', '/command/login', '/api/login']
+        auth_data = {
+            'user': self.username,
+            'pass': self.password
+        }
         
-        for endpoint in auth_endpoints:
+        for endpoint in self.AUTH_PATHS:
             try:
-                auth_data = {
-                    'user': self.username,
-                    'pass': self.password
-                }
-                
-                async with session.post(f"{self.base_url}{endpoint}", json=auth_data) as response:
+                async with self._request('POST', self._urls[endpoint], json=auth_data) as response:
                     if response.status in [200, 201]:
-                        content = await response.text()
-                        if 'success' in content.lower() or 'authenticated' in content.lower():
+                        content = (await response.text()).lower()
+                        if 'success' in content or 'authenticated' in content:
                             return True
             except Exception:
                 continue
         
         return False
     
+    @_with_deadline
+    @_breaker_operation
     async def get_status(self) -> Dict[str, Any]:
         """Get Fiery controller status."""
-        timeout = aiohttp.ClientTimeout(total=10)
+        if self._breaker.is_open:
+            return {
+                'status': 'error',
+                'ready': False,
+                'error': f"Circuit open for {self.ip_address}"
+            }
         
         try:
-            async with aiohttp.ClientSession(
-                cookies=self.session_cookies,
-                timeout=timeout
-            ) as session:
-                
-                # Try different status endpoints
-                status_endpoints = ['/wsi/status', '/status', '/command/status']
-                
-                for endpoint in status_endpoints:
-                    try:
-                        async with session.get(f"{self.base_url}{endpoint}") as response:
-                            if response.status == 200:
-                                content = await response.text()
-                                return self._parse_status_response(content)
-                    except Exception as e:
-                        logger.debug(f"Status endpoint {endpoint} failed: {e}")
-                
-                # Default status if no endpoint works
-                return {
-                    'status': 'online',
-                    'ready': True,
-                    'fiery_controller': True,
-                    'jobs_pending': 0,
-                    'error': None
-                }
-                
+            # Try different status endpoints, hedging the primary one
+            status = await self._hedged_first(
+                [self._fetch_status(endpoint) for endpoint in self.STATUS_PATHS]
+            )
+            if status is not None:
+                return status
+            
+            # Default status if no endpoint works
+            return {
+                'status': 'online',
+                'ready': True,
+                'fiery_controller': True,
+                'jobs_pending': 0,
+                'error': None
+            }
+            
         except Exception as e:
             logger.error(f"Failed to get Fiery status for {self.ip_address}: {e}")
             return {
@@ -250,8 +738,24 @@ class FieryClient:
                 'error': str(e)
             }
     
-    def _parse_status_response(self, content: str) -> Dict[str, Any]:
-        """Parse status response from Fiery controller."""
+    async def _fetch_status(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Fetch and parse status from a single endpoint."""
+        async def attempt() -> Optional[Dict[str, Any]]:
+            async with self._request('GET', self._urls[endpoint]) as response:
+                _check_transient(response)
+                if response.status == 200:
+                    kind, payload = await _read_body(response)
+                    return self._parse_status_response(kind, payload)
+            return None
+        
+        try:
+            return await _retry(attempt)
+        except Exception as e:
+            logger.debug(f"Status endpoint {endpoint} failed: {e}")
+        return None
+    
+    def _parse_status_response(self, kind: str, payload: Any) -> Dict[str, Any]:
+        """Parse status response from Fiery controller (see ``_read_body``)."""
         status = {
             'status': 'online',
             'ready': True,
@@ -261,27 +765,27 @@ class FieryClient:
         
         try:
             # Try XML parsing
-            if content.strip().startswith('<?xml') or content.strip().startswith('<'):
-                root = ET.fromstring(content)
+            if kind == 'xml':
+                root = _parse_xml(payload)
                 status['status'] = root.get('status', 'online')
                 status['ready'] = root.get('ready', 'true').lower() == 'true'
                 
-                jobs_elem = root.find('.//jobs')
+                jobs_elem = root.find(_JOBS_XPATH)
                 if jobs_elem is not None:
                     status['jobs_pending'] = int(jobs_elem.get('count', 0))
             
             # Try JSON parsing
-            elif content.strip().startswith('{'):
-                data = json.loads(content)
-                status.update(data)
+            elif kind == 'json':
+                status.update(payload)
             
             # Parse HTML/text response
             else:
-                if 'ready' in content.lower():
+                lower = payload.lower()
+                if 'ready' in lower:
                     status['ready'] = True
-                if 'busy' in content.lower() or 'processing' in content.lower():
+                if 'busy' in lower or 'processing' in lower:
                     status['ready'] = False
-                if 'error' in content.lower():
+                if 'error' in lower:
                     status['status'] = 'error'
                     
         except Exception as e:
@@ -289,65 +793,57 @@ class FieryClient:
         
         return status
     
-    async def get_capabilities(self) -> Dict[str, Any]:
-        """Get Fiery controller capabilities."""
-        return {
-            'supports_color': True,
-            'supports_duplex': True,
-            'max_paper_size': 'A3',
-            'supported_formats': ['PDF', 'PS', 'PCL', 'TIFF', 'JPEG'],
-            'fiery_controller': True,
-            'rip_processing': True,
-            'color_management': True,
-            'finishing_options': True,
-            'authentication_required': bool(self.password)
-        }
+    async def get_capabilities(self) -> Mapping[str, Any]:
+        """Get Fiery controller capabilities (read-only; copy before modifying)."""
+        return _FIERY_CAPABILITIES_BY_AUTH[bool(self.password)]
     
+    @_with_deadline
+    @_breaker_operation
     async def submit_print_job(self, file_path: str, job_settings: Dict[str, Any] = None) -> Dict[str, Any]:
         """Submit a print job to the Fiery controller."""
         if job_settings is None:
             job_settings = {}
         
+        if self._breaker.is_open:
+            return {
+                'status': 'error',
+                'message': f"Circuit open for {self.ip_address}"
+            }
+        
         timeout = aiohttp.ClientTimeout(total=60)  # Longer timeout for file uploads
         
         try:
-            async with aiohttp.ClientSession(
-                cookies=self.session_cookies,
-                timeout=timeout
-            ) as session:
-                
-                # Prepare multipart form data
-                data = aiohttp.FormData()
-                
-                # Add file
+            filename = os.path.basename(file_path)
+            
+            # Try different print endpoints
+            for endpoint in self.PRINT_PATHS:
+                # A multipart body can only be sent once, so reopen the file for every
+                # attempt; aiohttp streams the handle in chunks instead of loading it
                 with open(file_path, 'rb') as f:
-                    data.add_field('file', f.read(), filename=file_path.split('/')[-1])
-                
-                # Add job settings
-                for key, value in job_settings.items():
-                    data.add_field(key, str(value))
-                
-                # Try different print endpoints
-                print_endpoints = ['/wsi/print', '/print', '/command/print']
-                
-                for endpoint in print_endpoints:
+                    data = aiohttp.FormData()
+                    data.add_field('file', f, filename=filename, content_type='application/octet-stream')
+                    
+                    # Add job settings
+                    for key, value in job_settings.items():
+                        data.add_field(key, str(value))
+                    
                     try:
-                        async with session.post(f"{self.base_url}{endpoint}", data=data) as response:
+                        async with self._request('POST', self._urls[endpoint], data=data, timeout=timeout) as response:
                             if response.status in [200, 201, 202]:
-                                content = await response.text()
+                                kind, payload = await _read_body(response)
                                 return {
                                     'status': 'submitted',
-                                    'job_id': self._extract_job_id(content),
+                                    'job_id': self._extract_job_id(kind, payload),
                                     'message': 'Job submitted to Fiery controller'
                                 }
                     except Exception as e:
                         logger.debug(f"Print endpoint {endpoint} failed: {e}")
-                
-                return {
-                    'status': 'error',
-                    'message': 'Failed to submit job to any Fiery endpoint'
-                }
-                
+            
+            return {
+                'status': 'error',
+                'message': 'Failed to submit job to any Fiery endpoint'
+            }
+            
         except Exception as e:
             logger.error(f"Failed to submit print job to Fiery {self.ip_address}: {e}")
             return {
@@ -355,25 +851,23 @@ class FieryClient:
                 'message': str(e)
             }
     
-    def _extract_job_id(self, response_content: str) -> Optional[str]:
-        """Extract job ID from Fiery response."""
+    def _extract_job_id(self, kind: str, payload: Any) -> Optional[str]:
+        """Extract job ID from Fiery response (see ``_read_body``)."""
         try:
             # Try XML
-            if response_content.strip().startswith('<?xml') or response_content.strip().startswith('<'):
-                root = ET.fromstring(response_content)
-                job_elem = root.find('.//job')
+            if kind == 'xml':
+                root = _parse_xml(payload)
+                job_elem = root.find(_JOB_XPATH)
                 if job_elem is not None:
                     return job_elem.get('id')
             
             # Try JSON
-            elif response_content.strip().startswith('{'):
-                data = json.loads(response_content)
-                return data.get('job_id') or data.get('id')
+            elif kind == 'json':
+                return payload.get('job_id') or payload.get('id')
             
             # Try to find job ID in text
             else:
-                import re
-                job_match = re.search(r'job[_\s]*id[:\s]*([a-zA-Z0-9\-_]+)', response_content, re.IGNORECASE)
+                job_match = _JOBID_RE.search(payload)
                 if job_match:
                     return job_match.group(1)
                     
@@ -1,9 +1,32 @@
 """Konica Minolta 2100 device adapter."""
 
+import asyncio
+import socket
+from types import MappingProxyType
+from typing import Any, Mapping
+
 from .base_adapter import BaseDeviceAdapter
 from .snmp_client import SNMPClient
 from ..models.job import PrintJob
 
+# How long to wait for the printer to acknowledge our FIN after a job
+_CLOSE_TIMEOUT = 1.0
+
+# Read-only so it can be handed out without copying
+_CAPS_2100 = MappingProxyType({
+    "device_type": "2100",
+    "supports_color": False,  # Monochrome device
+    "supports_duplex": True,
+    "max_paper_size": "A4",
+    "supported_formats": ("PCL", "PS", "TEXT"),
+    "max_dpi": 600,
+    "print_methods": ("direct",),
+    "authentication_required": False,
+    "has_finisher": False,
+    "has_stapler": False,
+    "has_hole_punch": False
+})
+
 
 class KM2100Adapter(BaseDeviceAdapter):
     """Adapter for Konica Minolta 2100 printer.
@@ -15,49 +38,71 @@ class KM2100Adapter(BaseDeviceAdapter):
     def __init__(self, device, settings):
         super().__init__(device, settings)
         self.base_url = f"http://{device.ip_address}:{device.web_port}"
-        self.snmp_client = SNMPClient(device.ip_address, settings.snmp_community)
+        self.snmp_client = SNMPClient(
+            device.ip_address,
+            settings.snmp_community,
+            oid_batch_size=settings.snmp_oid_batch_size,
+            max_repetitions=settings.snmp_max_repetitions,
+            cache_ttl=settings.snmp_cache_ttl
+        )
     
     async def test_connection(self) -> dict:
         """Test connection to the 2100 device."""
-        results = {
+        # SNMP (primary method for older devices) and the direct print port are independent
+        snmp_result, direct_print_result = await asyncio.gather(
+            self._probe_snmp(),
+            self._probe_9100()
+        )
+        
+        return {
             "device_type": "2100",
-            "tests": {}
+            "tests": {
+                "snmp": snmp_result,
+                "direct_print": direct_print_result
+            }
         }
-        
-        # Test SNMP (primary method for older devices)
+    
+    async def _probe_snmp(self) -> dict:
+        """Check that the device answers SNMP."""
         try:
             device_info = await self.snmp_client.get_device_info()
-            results["tests"]["snmp"] = {
+            return {
                 "status": "pass",
                 "message": f"SNMP working: {device_info.get('description', 'Unknown device')}"
             }
         except Exception as e:
-            results["tests"]["snmp"] = {
+            return {
                 "status": "fail", 
                 "message": str(e)
             }
-        
-        # Test direct printing port
+    
+    async def _probe_9100(self) -> dict:
+        """Check that the direct print port accepts connections."""
+        # A bare non-blocking connect is enough; no stream objects or transport needed
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
         try:
-            import asyncio
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(self.device.ip_address, 9100),
+            await asyncio.wait_for(
+                loop.sock_connect(sock, (self.device.ip_address, 9100)),
                 timeout=5.0
             )
-            writer.close()
-            await writer.wait_closed()
             
-            results["tests"]["direct_print"] = {
+            return {
                 "status": "pass",
                 "message": "Direct print port accessible"
             }
         except Exception as e:
-            results["tests"]["direct_print"] = {
+            return {
                 "status": "fail",
                 "message": str(e)
             }
-        
-        return results
+        finally:
+            sock.close()
+    
+    async def close(self) -> None:
+        """Release the SNMP socket."""
+        self.snmp_client.close()
     
     async def authenticate(self) -> bool:
         """Authentication for 2100 (may not be required)."""
@@ -73,8 +118,7 @@ class KM2100Adapter(BaseDeviceAdapter):
         }
         
         try:
-            device_info = await self.snmp_client.get_device_info()
-            printer_status = await self.snmp_client.get_printer_status()
+            device_info, printer_status = await self.snmp_client.get_info_and_status()
             
             status.update({
                 "reachable": True,
@@ -89,50 +133,36 @@ class KM2100Adapter(BaseDeviceAdapter):
     
     async def print_document(self, job: PrintJob) -> dict:
         """Submit a print job to the device."""
-        import asyncio
-        
         try:
-            # Read the file to print
             with open(job.file_path, 'rb') as f:
-                file_data = f.read()
-            
-            # Connect to printer's direct print port
-            reader, writer = await asyncio.open_connection(
-                self.device.ip_address, 
-                9100
-            )
-            
-            try:
-                # Send raw data
-                writer.write(file_data)
-                await writer.drain()
+                # Connect to printer's direct print port
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.device.ip_address, 9100),
+                    timeout=self.settings.print_timeout
+                )
                 
-                return {
-                    "status": "success",
-                    "message": f"Print job {job.id} sent to device",
-                    "method": "direct_print",
-                    "bytes_sent": len(file_data)
-                }
-            
-            finally:
-                writer.close()
-                await writer.wait_closed()
+                try:
+                    # Stream raw data without loading the whole file
+                    bytes_sent = await self._stream_file(writer, f)
+                    
+                    return {
+                        "status": "success",
+                        "message": f"Print job {job.id} sent to device",
+                        "method": "direct_print",
+                        "bytes_sent": bytes_sent
+                    }
+                
+                finally:
+                    # The data is already out; don't hold the job on the printer's close handshake
+                    writer.close()
+                    try:
+                        await asyncio.wait_for(writer.wait_closed(), timeout=_CLOSE_TIMEOUT)
+                    except (asyncio.TimeoutError, OSError):
+                        pass
         
         except Exception as e:
             return self._handle_error("print_document", e)
     
-    async def get_capabilities(self) -> dict:
-        """Get device capabilities."""
-        return {
-            "device_type": "2100",
-            "supports_color": False,  # Monochrome device
-            "supports_duplex": True,
-            "max_paper_size": "A4",
-            "supported_formats": ["PCL", "PS", "TEXT"],
-            "max_dpi": 600,
-            "print_methods": ["direct"],
-            "authentication_required": False,
-            "has_finisher": False,
-            "has_stapler": False,
-            "has_hole_punch": False
-        }
\ No newline at end of file
+    async def get_capabilities(self) -> Mapping[str, Any]:
+        """Get device capabilities (read-only; copy before modifying)."""
+        return _CAPS_2100
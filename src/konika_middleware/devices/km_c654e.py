@@ -2,7 +2,8 @@
 
 import aiohttp
 import asyncio
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, Optional, ClassVar
 from urllib.parse import urlencode
 import json
 
@@ -12,82 +13,170 @@ from ..models.job import PrintJob
 from ..core.exceptions import DeviceConnectionError, DeviceAuthenticationError
 
 
+# Cookies the WCD web UI expects from a browser; seeded into every adapter session
+_BASE_COOKIES = {
+    'bv': 'Chrome/138.0.0.0',
+    'uatype': 'NN',
+    'lang': 'En',
+    'favmode': 'false',
+    'vm': 'Html',
+    'param': '',
+    'access': '',
+    'bm': 'Low',
+    'selno': 'En'
+}
+
+# Quick reachability probes use a shorter budget than the session default
+_PROBE_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# Connection test outcomes
+_PASS = "pass"
+_FAIL = "fail"
+_ERROR = "error"
+
+# Responses that show the web server is up
+_HTTP_OK_CODES = frozenset({200, 301, 302})
+
+# Keep idle connections well past the device manager's 30 s poll interval (aiohttp's default is 15 s),
+# so consecutive polls reuse the pooled connection instead of reconnecting
+_KEEPALIVE_TIMEOUT = 75
+
+# ROM version as embedded in the WCD version page's script block
+_ROM_RE = re.compile(r'pcm_romversion\s*=\s*"([^"]+)"')
+
+
 class KMC654eAdapter(BaseDeviceAdapter):
     """Adapter for Konica Minolta C654e printer."""
     
+    # Static capabilities; model adapters extend this, get_capabilities() adds the per-device bits
+    CAPABILITIES: ClassVar[Dict[str, Any]] = {
+        "supports_color": True,
+        "supports_duplex": True,
+        "max_paper_size": "A3",
+        "supported_formats": ("PDF", "PS", "PCL", "TEXT"),
+        "max_dpi": 1200,
+        "print_methods": ("direct", "ipp"),
+        "has_finisher": False,
+        "has_stapler": True,
+        "has_hole_punch": True
+    }
+    
     def __init__(self, device, settings):
         super().__init__(device, settings)
         self.base_url = f"http://{device.ip_address}:{device.web_port}"
         self.wcd_url = f"{self.base_url}/wcd"
-        self.session_cookies = {}
         self.authenticated = False
-        self.snmp_client = SNMPClient(device.ip_address, settings.snmp_community)
+        self.snmp_client = SNMPClient(
+            device.ip_address,
+            settings.snmp_community,
+            oid_batch_size=settings.snmp_oid_batch_size,
+            max_repetitions=settings.snmp_max_repetitions,
+            cache_ttl=settings.snmp_cache_ttl
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the adapter's HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    limit_per_host=4,
+                    keepalive_timeout=_KEEPALIVE_TIMEOUT,
+                    force_close=False
+                ),
+                # The device is addressed by IP, which the default jar refuses to store cookies for
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                cookies=_BASE_COOKIES,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the adapter's HTTP session and SNMP socket."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self.snmp_client.close()
     
     async def test_connection(self) -> Dict[str, Any]:
         """Test connection to the C654e device."""
-        results = {
-            "device_type": "C654e",
-            "tests": {}
+        session = await self._get_session()
+        
+        # The probes are independent, so run them concurrently
+        probes = {
+            "http_basic": self._test_http_basic(session),
+            "wcd_interface": self._test_wcd(session),
+            "snmp": self._test_snmp()
         }
+        # Test authentication if password is configured
+        if self.device.admin_password:
+            probes["authentication"] = self._test_auth()
+        
+        outcomes = await asyncio.gather(*probes.values())
         
-        # Test basic HTTP connectivity
+        return {
+            "device_type": "C654e",
+            "tests": dict(zip(probes, outcomes))
+        }
+    
+    async def _test_http_basic(self, session: aiohttp.ClientSession) -> Dict[str, Any]:
+        """Test basic HTTP connectivity."""
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(self.base_url) as response:
-                    results["tests"]["http_basic"] = {
-                        "status": "pass" if response.status in [200, 301, 302] else "fail",
-                        "status_code": response.status,
-                        "message": f"HTTP response: {response.status}"
-                    }
+            async with session.get(self.base_url, timeout=_PROBE_TIMEOUT) as response:
+                return {
+                    "status": _PASS if response.status in _HTTP_OK_CODES else _FAIL,
+                    "status_code": response.status,
+                    "message": f"HTTP response: {response.status}"
+                }
         except Exception as e:
-            results["tests"]["http_basic"] = {
-                "status": "error",
+            return {
+                "status": _ERROR,
                 "message": str(e)
             }
-        
-        # Test WCD interface
+    
+    async def _test_wcd(self, session: aiohttp.ClientSession) -> Dict[str, Any]:
+        """Test the WCD interface."""
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(f"{self.wcd_url}/index.html") as response:
-                    results["tests"]["wcd_interface"] = {
-                        "status": "pass" if response.status == 200 else "fail",
-                        "status_code": response.status,
-                        "message": f"WCD interface response: {response.status}"
-                    }
+            async with session.get(f"{self.wcd_url}/index.html", timeout=_PROBE_TIMEOUT) as response:
+                return {
+                    "status": _PASS if response.status == 200 else _FAIL,
+                    "status_code": response.status,
+                    "message": f"WCD interface response: {response.status}"
+                }
         except Exception as e:
-            results["tests"]["wcd_interface"] = {
-                "status": "error",
+            return {
+                "status": _ERROR,
                 "message": str(e)
             }
-        
-        # Test SNMP
+    
+    async def _test_snmp(self) -> Dict[str, Any]:
+        """Test SNMP."""
         try:
             device_info = await self.snmp_client.get_device_info()
-            results["tests"]["snmp"] = {
-                "status": "pass",
+            return {
+                "status": _PASS,
                 "message": f"SNMP working: {device_info.get('description', 'Unknown device')}"
             }
         except Exception as e:
-            results["tests"]["snmp"] = {
-                "status": "fail",
+            return {
+                "status": _FAIL,
+                "message": str(e)
+            }
+    
+    async def _test_auth(self) -> Dict[str, Any]:
+        """Test admin authentication."""
+        try:
+            auth_result = await self.authenticate()
+            return {
+                "status": _PASS if auth_result else _FAIL,
+                "message": "Admin authentication successful" if auth_result else "Admin authentication failed"
+            }
+        except Exception as e:
+            return {
+                "status": _ERROR,
                 "message": str(e)
             }
-        
-        # Test authentication if password is configured
-        if self.device.admin_password:
-            try:
-                auth_result = await self.authenticate()
-                results["tests"]["authentication"] = {
-                    "status": "pass" if auth_result else "fail",
-                    "message": "Admin authentication successful" if auth_result else "Admin authentication failed"
-                }
-            except Exception as e:
-                results["tests"]["authentication"] = {
-                    "status": "error",
-                    "message": str(e)
-                }
-        
-        return results
     
     async def authenticate(self) -> bool:
         """Authenticate with the device using admin credentials."""
@@ -96,48 +185,29 @@ class KMC654eAdapter(BaseDeviceAdapter):
             return False
         
         try:
-            # Set up session cookies
-            base_cookies = {
-                'bv': 'Chrome/138.0.0.0',
-                'uatype': 'NN',
-                'lang': 'En',
-                'favmode': 'false',
-                'vm': 'Html',
-                'param': '',
-                'access': '',
-                'bm': 'Low',
-                'selno': 'En'
-            }
-            
             # Prepare login data
             login_data = {
                 'func': 'PSL_LP1_LOG',
                 'password': self.device.admin_password
             }
             
-            async with aiohttp.ClientSession(
-                cookies=base_cookies,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as session:
+            session = await self._get_session()
+            
+            # Submit login
+            async with session.post(
+                f"{self.wcd_url}/login.cgi",
+                data=login_data,
+                headers={'Content-Type': 'application/x-www-form-urlencoded'}
+            ) as response:
                 
-                # Submit login
-                async with session.post(
-                    f"{self.wcd_url}/login.cgi",
-                    data=login_data,
-                    headers={'Content-Type': 'application/x-www-form-urlencoded'}
-                ) as response:
-                    
-                    if response.status == 200:
-                        # Store session cookies - fix cookie handling
-                        self.session_cookies = {}
-                        for cookie in session.cookie_jar:
-                            self.session_cookies[cookie.key] = cookie.value
-                        self.authenticated = True
-                        self.logger.info("Successfully authenticated with device")
-                        return True
-                    else:
-                        self.logger.error(f"Authentication failed with status: {response.status}")
-                        return False
+                if response.status == 200:
+                    # The login cookies stay in the session's jar for later WCD requests
+                    self.authenticated = True
+                    self.logger.info("Successfully authenticated with device")
+                    return True
+                else:
+                    self.logger.error(f"Authentication failed with status: {response.status}")
+                    return False
         
         except Exception as e:
             self.logger.error(f"Authentication error: {e}")
@@ -151,58 +221,66 @@ class KMC654eAdapter(BaseDeviceAdapter):
             "timestamp": asyncio.get_event_loop().time()
         }
         
-        try:
-            # Get basic connectivity status
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(self.base_url) as response:
-                    status["http_status"] = response.status
-                    status["reachable"] = response.status in [200, 301, 302]
-        except Exception as e:
+        # HTTP, SNMP and WCD queries are independent, so issue them all at once
+        queries = [
+            self._get_http_status(),
+            self.snmp_client.poll_all()
+        ]
+        # Get WCD-specific information if authenticated
+        if self.authenticated:
+            queries.append(self._get_wcd_status())
+        
+        http_status, snmp, *wcd = await asyncio.gather(
+            *queries, return_exceptions=True
+        )
+        
+        # Get basic connectivity status
+        if isinstance(http_status, Exception):
             status["http_status"] = None
             status["reachable"] = False
-            status["error"] = str(e)
+            status["error"] = str(http_status)
+        else:
+            status["http_status"] = http_status
+            status["reachable"] = http_status in _HTTP_OK_CODES
         
         # Get SNMP information
-        try:
-            device_info = await self.snmp_client.get_device_info()
-            printer_status = await self.snmp_client.get_printer_status()
-            supply_levels = await self.snmp_client.get_supply_levels()
-            
+        if isinstance(snmp, Exception):
+            status["snmp_error"] = str(snmp)
+        else:
             status.update({
-                "snmp_info": device_info,
-                "printer_status": printer_status.get("status", "unknown"),
-                "pages_printed": printer_status.get("pages_printed"),
-                "toner_levels": supply_levels
+                "snmp_info": snmp["device_info"],
+                "printer_status": snmp["printer_status"],
+                "pages_printed": snmp["pages_printed"],
+                "toner_levels": snmp["supply_levels"]
             })
-        except Exception as e:
-            status["snmp_error"] = str(e)
         
-        # Get WCD-specific information if authenticated
-        if self.authenticated and self.session_cookies:
-            try:
-                wcd_status = await self._get_wcd_status()
-                status["wcd_status"] = wcd_status
-            except Exception as e:
-                status["wcd_error"] = str(e)
+        if wcd:
+            if isinstance(wcd[0], Exception):
+                status["wcd_error"] = str(wcd[0])
+            else:
+                status["wcd_status"] = wcd[0]
         
         return status
     
+    async def _get_http_status(self) -> int:
+        """Return the HTTP status code of the device's web root."""
+        session = await self._get_session()
+        async with session.get(self.base_url, timeout=_PROBE_TIMEOUT) as response:
+            return response.status
+    
     async def _get_wcd_status(self) -> Dict[str, Any]:
         """Get status information through WCD interface."""
         try:
-            async with aiohttp.ClientSession(
-                cookies=self.session_cookies,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as session:
-                
-                # Try to get device information page
-                async with session.get(f"{self.wcd_url}/version.html") as response:
-                    if response.status == 200:
-                        version_text = await response.text()
-                        return {
-                            "version_info": self._parse_version_info(version_text),
-                            "authenticated": True
-                        }
+            session = await self._get_session()
+            
+            # Try to get device information page
+            async with session.get(f"{self.wcd_url}/version.html") as response:
+                if response.status == 200:
+                    version_text = await response.text()
+                    return {
+                        "version_info": self._parse_version_info(version_text),
+                        "authenticated": True
+                    }
         
         except Exception as e:
             self.logger.error(f"WCD status error: {e}")
@@ -211,16 +289,8 @@ class KMC654eAdapter(BaseDeviceAdapter):
     
     def _parse_version_info(self, html_content: str) -> Dict[str, str]:
         """Parse version information from HTML content."""
-        info = {}
-        
-        # Extract ROM version using simple string search
-        if 'pcm_romversion' in html_content:
-            start = html_content.find('pcm_romversion = "') + 19
-            end = html_content.find('"', start)
-            if start > 18 and end > start:
-                info['rom_version'] = html_content[start:end]
-        
-        return info
+        match = _ROM_RE.search(html_content)
+        return {"rom_version": match.group(1)} if match else {}
     
     async def print_document(self, job: PrintJob) -> Dict[str, Any]:
         """Submit a print job to the device."""
@@ -248,9 +318,17 @@ class KMC654eAdapter(BaseDeviceAdapter):
     
     async def _check_device_ready(self) -> bool:
         """Check if device is ready to accept print jobs."""
+        # Skip the full get_status(); the printer state comes from the SNMP cache when fresh
         try:
-            status = await self.get_status()
-            return status.get("reachable", False) and status.get("printer_status") in ["idle", "ready"]
+            http_status, printer_status = await asyncio.gather(
+                self._get_http_status(),
+                self.snmp_client.get_printer_status()
+            )
+            # An unknown SNMP state is not known to be busy, so reachability decides
+            return (
+                http_status in _HTTP_OK_CODES
+                and printer_status.get("status") in ("idle", "ready", "unknown")
+            )
         except Exception:
             return False
     
@@ -264,52 +342,40 @@ class KMC654eAdapter(BaseDeviceAdapter):
     async def _print_via_direct(self, job: PrintJob) -> Dict[str, Any]:
         """Attempt to print via direct connection to port 9100."""
         try:
-            # Read the file to print
             with open(job.file_path, 'rb') as f:
-                file_data = f.read()
-            
-            # Connect to printer's direct print port
-            reader, writer = await asyncio.open_connection(
-                self.device.ip_address, 
-                self.device.direct_print_port
-            )
-            
-            try:
-                # For PDFs and other formats, we'd need to convert to PCL/PostScript
-                # For now, just send raw data (works for plain text, PCL, PS)
-                writer.write(file_data)
-                await writer.drain()
+                # Connect to printer's direct print port
+                reader, writer = await asyncio.open_connection(
+                    self.device.ip_address, 
+                    self.device.direct_print_port
+                )
                 
-                # Close connection
-                writer.close()
-                await writer.wait_closed()
-                
-                return {
-                    "status": "success",
-                    "message": f"Print job {job.id} sent to device",
-                    "method": "direct_print",
-                    "bytes_sent": len(file_data)
-                }
-            
-            finally:
-                if not writer.is_closing():
+                try:
+                    # For PDFs and other formats, we'd need to convert to PCL/PostScript
+                    # For now, just send raw data (works for plain text, PCL, PS),
+                    # streamed so memory use doesn't grow with the file size
+                    bytes_sent = await self._stream_file(writer, f)
+                    
+                    # Close connection
                     writer.close()
                     await writer.wait_closed()
+                    
+                    return {
+                        "status": "success",
+                        "message": f"Print job {job.id} sent to device",
+                        "method": "direct_print",
+                        "bytes_sent": bytes_sent
+                    }
+                
+                finally:
+                    if not writer.is_closing():
+                        writer.close()
+                        await writer.wait_closed()
         
         except Exception as e:
             return self._handle_error("direct_print", e)
     
     async def get_capabilities(self) -> Dict[str, Any]:
         """Get device capabilities."""
-        return {
-            "supports_color": True,
-            "supports_duplex": True,
-            "max_paper_size": "A3",
-            "supported_formats": ["PDF", "PS", "PCL", "TEXT"],
-            "max_dpi": 1200,
-            "print_methods": ["direct", "ipp"],
-            "authentication_required": bool(self.device.admin_password),
-            "has_finisher": False,
-            "has_stapler": True,
-            "has_hole_punch": True
-        }
\ No newline at end of file
+        capabilities = dict(self.CAPABILITIES)
+        capabilities["authentication_required"] = bool(self.device.admin_password)
+        return capabilities
\ No newline at end of file
@@ -10,16 +10,11 @@ class KMC754eAdapter(KMC654eAdapter):
     This can be customized for C754e-specific features.
     """
     
-    async def get_capabilities(self) -> dict:
-        """Get C754e-specific capabilities."""
-        capabilities = await super().get_capabilities()
-        
-        # C754e-specific capabilities
-        capabilities.update({
-            "device_type": "C754e",
-            "max_dpi": 1800,
-            "supports_envelope_printing": True,
-            "has_bypass_tray": True
-        })
-        
-        return capabilities
\ No newline at end of file
+    # C754e-specific capabilities
+    CAPABILITIES = {
+        **KMC654eAdapter.CAPABILITIES,
+        "device_type": "C754e",
+        "max_dpi": 1800,
+        "supports_envelope_printing": True,
+        "has_bypass_tray": True
+    }
\ No newline at end of file
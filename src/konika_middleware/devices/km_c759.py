@@ -10,17 +10,12 @@ class KMC759Adapter(KMC654eAdapter):
     This can be customized for C759-specific features.
     """
     
-    async def get_capabilities(self) -> dict:
-        """Get C759-specific capabilities."""
-        capabilities = await super().get_capabilities()
-        
-        # C759-specific capabilities
-        capabilities.update({
-            "device_type": "C759",
-            "max_paper_size": "A3+",
-            "supports_booklet": True,
-            "max_dpi": 1800,
-            "has_large_capacity_tray": True
-        })
-        
-        return capabilities
\ No newline at end of file
+    # C759-specific capabilities
+    CAPABILITIES = {
+        **KMC654eAdapter.CAPABILITIES,
+        "device_type": "C759",
+        "max_paper_size": "A3+",
+        "supports_booklet": True,
+        "max_dpi": 1800,
+        "has_large_capacity_tray": True
+    }
\ No newline at end of file
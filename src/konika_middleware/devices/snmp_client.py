@@ -1,11 +1,22 @@
 """SNMP client for device monitoring."""
 
 import asyncio
-from typing import Dict, Any, Optional
+import re
+import time
+from typing import Dict, Any, Optional, Tuple, List, Callable, Awaitable
 import logging
 
+try:
+    import aiosnmp
+except ImportError:  # aiosnmp is optional; fall back to the net-snmp command line tools
+    aiosnmp = None
+
+
 logger = logging.getLogger(__name__)
 
+# One net-snmp output line: "<oid> = <type>: <value>"
+_SNMP_LINE_RE = re.compile(r'^(\S+) = ([\w-]+): ?(.*)$', re.MULTILINE)
+
 
 class SNMPClient:
     """SNMP client for querying device information."""
@@ -18,29 +29,130 @@ class SNMPClient:
     SYSTEM_DESCRIPTION = "1.3.6.1.2.1.1.1.0"
     SYSTEM_UPTIME = "1.3.6.1.2.1.1.3.0"
     SYSTEM_NAME = "1.3.6.1.2.1.1.5.0"
+    # Everything get_device_info() reports; fetched with one GET rather than a walk
+    SYSTEM_INFO_OIDS = (SYSTEM_DESCRIPTION, SYSTEM_UPTIME, SYSTEM_NAME)
     
     # Printer-specific OIDs
     PRINTER_STATUS = "1.3.6.1.2.1.25.3.2.1.5.1"
     PRINTER_PAGES_PRINTED = "1.3.6.1.2.1.43.10.2.1.4.1.1"
     
-    def __init__(self, host: str, community: str = "public", version: str = "2c", timeout: int = 5):
+    # Printer MIB prtMarkerSuppliesEntry and the columns we read from it
+    SUPPLIES_OID = "1.3.6.1.2.1.43.11.1.1"
+    SUPPLY_DESCRIPTION_COLUMN = "6"
+    SUPPLY_MAX_CAPACITY_COLUMN = "8"
+    SUPPLY_LEVEL_COLUMN = "9"
+    
+    # Status codes mapped onto the printer states the API has always reported
+    # (idle, printing, warmup, unknown); running(2) also counts as idle
+    DEVICE_STATUS_NAMES = {1: "idle", 2: "idle", 3: "printing", 4: "warmup"}
+    
+    def __init__(
+        self,
+        host: str,
+        community: str = "public",
+        version: str = "2c",
+        timeout: int = 5,
+        retries: int = 1,
+        oid_batch_size: int = 5,
+        max_repetitions: int = 10,
+        cache_ttl: float = 0.0
+    ):
         self.host = host
         self.community = community
         self.version = version
         self.timeout = timeout
+        self.retries = retries
+        # Too large and printers answer tooBig, too small and we waste round-trips
+        self.oid_batch_size = max(1, oid_batch_size)
+        self.max_repetitions = max(1, max_repetitions)
+        # Seconds to reuse query results for; 0 disables caching
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        # aiosnmp speaks SNMPv2c only; anything else goes through the command line tools
+        self._native = aiosnmp is not None and version == "2c"
+        self._snmp = None
+        # Created on first use so it belongs to the loop that runs the queries
+        self._snmp_lock: Optional[asyncio.Lock] = None
+    
+    async def _get_snmp(self):
+        """Return the in-process SNMP session, creating and connecting it on first use."""
+        if self._snmp is not None and self._snmp.is_connected:
+            return self._snmp
+        
+        if self._snmp_lock is None:
+            self._snmp_lock = asyncio.Lock()
+        async with self._snmp_lock:
+            if self._snmp is None or self._snmp.is_closed:
+                self._snmp = aiosnmp.Snmp(
+                    host=self.host,
+                    community=self.community,
+                    timeout=self.timeout,
+                    retries=self.retries,
+                    max_repetitions=self.max_repetitions
+                )
+            # Open the UDP endpoint once here; aiosnmp connects lazily per request, so
+            # concurrent first queries would each open their own and leak all but one
+            await self._snmp.__aenter__()
+        return self._snmp
+    
+    def _cache_get(self, key: str) -> Optional[Any]:
+        """Return a cached result that is still fresh, else None."""
+        hit = self._cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < self.cache_ttl:
+            return hit[1]
+        return None
+    
+    def _cache_put(self, key: str, value: Any) -> None:
+        if self.cache_ttl > 0:
+            self._cache[key] = (time.monotonic(), value)
+    
+    async def _cached(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True
+    ) -> Any:
+        """Serve ``key`` from the cache or run ``fetch`` and remember its result."""
+        value = self._cache_get(key)
+        if value is None:
+            value = await fetch()
+            if cacheable(value):
+                self._cache_put(key, value)
+        return value
+    
+    async def _get_values(self, oids: List[str]) -> Dict[str, Any]:
+        """GET ``oids`` in batches of ``oid_batch_size``, sent concurrently, and merge the values."""
+        snmp = await self._get_snmp()
+        batches = [oids[i:i + self.oid_batch_size] for i in range(0, len(oids), self.oid_batch_size)]
+        values = {}
+        for varbinds in await asyncio.gather(*(snmp.get(batch) for batch in batches)):
+            values.update(self._varbind_values(varbinds))
+        return values
+    
+    def close(self) -> None:
+        """Release the UDP socket held by the in-process SNMP session."""
+        if self._snmp is not None:
+            self._snmp.close()
+            self._snmp = None
     
     async def get_device_info(self) -> Dict[str, Any]:
         """Get basic device information via SNMP."""
+        return await self._cached("device_info", self._fetch_device_info)
+    
+    async def _fetch_device_info(self) -> Dict[str, Any]:
         try:
-            # Use subprocess to call snmpget/snmpwalk since pysnmp is complex for async
-            result = await self._run_snmp_command("snmpwalk", [
-                "-v", self.version,
-                "-c", self.community,
+            if self._native:
+                values = await self._get_values(list(self.SYSTEM_INFO_OIDS))
+                return self._info_from_values(values)
+            
+            result = await self._run_snmp_command("snmpget", [
+                *self._session_args(),
+                "-On",  # Numeric OIDs so each line can be matched to what we asked for
                 self.host,
-                self.SYSTEM_OID
+                *self.SYSTEM_INFO_OIDS
             ])
             
-            return self._parse_system_info(result)
+            return self._info_from_varbinds(self._parse_varbinds(result))
             
         except Exception as e:
             logger.error(f"SNMP query failed for {self.host}: {e}")
@@ -48,42 +160,145 @@ class SNMPClient:
     
     async def get_printer_status(self) -> Dict[str, Any]:
         """Get printer-specific status information."""
-        try:
-            # Get printer status
-            status_result = await self._run_snmp_command("snmpget", [
-                "-v", self.version,
-                "-c", self.community,
+        # Failed queries come back as "unknown"; don't pin those for a whole TTL
+        return await self._cached(
+            "printer_status",
+            self._fetch_printer_status,
+            lambda status: status["status"] != "unknown"
+        )
+    
+    async def _fetch_printer_status(self) -> Dict[str, Any]:
+        if self._native:
+            try:
+                # Both OIDs travel in a single GET
+                values = await self._get_values([self.PRINTER_STATUS, self.PRINTER_PAGES_PRINTED])
+            except Exception as e:
+                logger.error(f"SNMP printer status query failed for {self.host}: {e}")
+                return {"status": "unknown", "pages_printed": None}
+            
+            return self._status_from_values(values)
+        
+        # Printer status and pages printed (if available) are fetched concurrently
+        status_result, pages_result = await asyncio.gather(
+            self._run_snmp_command("snmpget", [
+                *self._session_args(),
                 self.host,
                 self.PRINTER_STATUS
-            ])
+            ]),
+            self._run_snmp_command("snmpget", [
+                *self._session_args(),
+                self.host,
+                self.PRINTER_PAGES_PRINTED
+            ]),
+            return_exceptions=True
+        )
+        
+        status = {"status": "unknown", "pages_printed": None}
+        
+        if isinstance(status_result, Exception):
+            logger.error(f"SNMP printer status query failed for {self.host}: {status_result}")
+        else:
+            status["status"] = self._parse_printer_status(status_result)
+        
+        if isinstance(pages_result, Exception):
+            logger.error(f"SNMP pages printed query failed for {self.host}: {pages_result}")
+        else:
+            status["pages_printed"] = self._parse_pages_printed(pages_result)
+        
+        return status
+    
+    async def get_info_and_status(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Get device information and printer status with a single SNMP GET.
+        
+        Equivalent to get_device_info() followed by get_printer_status(), but all
+        OIDs travel in one request PDU, so a poll costs one round-trip instead of three.
+        Shares its cache entries with those two methods.
+        """
+        info = self._cache_get("device_info")
+        status = self._cache_get("printer_status")
+        if info is not None and status is not None:
+            return info, status
+        
+        info, status = await self._fetch_info_and_status()
+        self._cache_put("device_info", info)
+        if status["status"] != "unknown":
+            self._cache_put("printer_status", status)
+        return info, status
+    
+    async def _fetch_info_and_status(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        if self._native:
+            try:
+                values = await self._get_values([
+                    *self.SYSTEM_INFO_OIDS,
+                    self.PRINTER_STATUS,
+                    self.PRINTER_PAGES_PRINTED
+                ])
+            except Exception as e:
+                logger.error(f"SNMP query failed for {self.host}: {e}")
+                raise
             
-            # Get pages printed (if available)
-            pages_result = await self._run_snmp_command("snmpget", [
-                "-v", self.version,
-                "-c", self.community,
+            return self._info_from_values(values), self._status_from_values(values)
+        
+        try:
+            result = await self._run_snmp_command("snmpget", [
+                *self._session_args(),
+                "-On",  # Numeric OIDs so each line can be matched to what we asked for
                 self.host,
+                *self.SYSTEM_INFO_OIDS,
+                self.PRINTER_STATUS,
                 self.PRINTER_PAGES_PRINTED
             ])
-            
-            return {
-                "status": self._parse_printer_status(status_result),
-                "pages_printed": self._parse_pages_printed(pages_result)
-            }
-            
         except Exception as e:
-            logger.error(f"SNMP printer status query failed for {self.host}: {e}")
-            return {"status": "unknown", "pages_printed": None}
+            logger.error(f"SNMP query failed for {self.host}: {e}")
+            raise
+        
+        varbinds = self._parse_varbinds(result)
+        info = self._info_from_varbinds(varbinds)
+        
+        status = {
+            "status": self._parse_printer_status(varbinds.get(self.PRINTER_STATUS, "")),
+            "pages_printed": self._parse_pages_printed(varbinds.get(self.PRINTER_PAGES_PRINTED, ""))
+        }
+        
+        return info, status
+    
+    async def poll_all(self) -> Dict[str, Any]:
+        """Fetch device info, printer status and supply levels concurrently.
+        
+        Raises like get_device_info() when the device does not answer SNMP.
+        """
+        results = await asyncio.gather(
+            self.get_device_info(),
+            self.get_printer_status(),
+            self.get_supply_levels(),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        
+        device_info, printer_status, supply_levels = results
+        return {
+            "device_info": device_info,
+            "printer_status": printer_status.get("status", "unknown"),
+            "pages_printed": printer_status.get("pages_printed"),
+            "supply_levels": supply_levels
+        }
     
     async def get_supply_levels(self) -> Dict[str, Any]:
         """Get toner/supply level information."""
+        # An empty result usually means the query failed
+        return await self._cached("supply_levels", self._fetch_supply_levels, bool)
+    
+    async def _fetch_supply_levels(self) -> Dict[str, Any]:
         try:
+            if self._native:
+                snmp = await self._get_snmp()
+                varbinds = await snmp.bulk_walk(self.SUPPLIES_OID)
+                return self._parse_supply_varbinds(varbinds)
+            
             # Query supply levels (OID varies by manufacturer)
-            result = await self._run_snmp_command("snmpwalk", [
-                "-v", self.version,
-                "-c", self.community,
-                self.host,
-                "1.3.6.1.2.1.43.11.1.1"  # Supply levels
-            ])
+            result = await self._run_snmp_command(*self._walk_command(self.SUPPLIES_OID))
             
             return self._parse_supply_levels(result)
             
@@ -91,6 +306,28 @@ class SNMPClient:
             logger.error(f"SNMP supply levels query failed for {self.host}: {e}")
             return {}
     
+    def _session_args(self) -> List[str]:
+        """Version, community, timeout and retry options shared by every command line call."""
+        return [
+            "-v", self.version,
+            "-c", self.community,
+            "-t", str(self.timeout),
+            "-r", str(self.retries)
+        ]
+    
+    def _walk_command(self, oid: str) -> Tuple[str, List[str]]:
+        """Command line tool and arguments for walking the subtree under ``oid``."""
+        if self.version == "1":
+            return "snmpwalk", [*self._session_args(), self.host, oid]
+        
+        # SNMPv2c and later can walk with GETBULK, max_repetitions rows per round-trip
+        return "snmpbulkwalk", [
+            *self._session_args(),
+            f"-Cr{self.max_repetitions}",
+            self.host,
+            oid
+        ]
+    
     async def _run_snmp_command(self, command: str, args: list) -> str:
         """Run SNMP command and return output."""
         cmd = [command] + args
@@ -108,71 +345,174 @@ class SNMPClient:
         
         return stdout.decode()
     
-    def _parse_system_info(self, snmp_output: str) -> Dict[str, Any]:
-        """Parse system information from SNMP output."""
+    # Varbind parsers for the in-process (aiosnmp) path
+    
+    @staticmethod
+    def _varbind_values(varbinds: List[Any]) -> Dict[str, Any]:
+        """Map varbinds to {oid without leading dot: value}; missing OIDs have value None."""
+        return {vb.oid[1:]: vb.value for vb in varbinds}
+    
+    @staticmethod
+    def _text(value: Any) -> str:
+        """Decode an OCTET STRING value."""
+        if isinstance(value, bytes):
+            return value.decode('utf-8', errors='replace')
+        return str(value)
+    
+    @staticmethod
+    def _format_timeticks(ticks: int) -> str:
+        """Format TimeTicks like net-snmp does, e.g. '(12345678) 1 day, 10:17:36.78'."""
+        seconds, centis = divmod(ticks, 100)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        clock = f"{hours}:{minutes:02d}:{seconds:02d}.{centis:02d}"
+        if days:
+            clock = f"{days} day{'s' if days != 1 else ''}, {clock}"
+        return f"({ticks}) {clock}"
+    
+    def _info_from_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the get_device_info() dict from varbind values."""
         info = {}
         
+        if values.get(self.SYSTEM_DESCRIPTION) is not None:
+            info['description'] = self._text(values[self.SYSTEM_DESCRIPTION])
+        if isinstance(values.get(self.SYSTEM_UPTIME), int):
+            info['uptime'] = self._format_timeticks(values[self.SYSTEM_UPTIME])
+        if values.get(self.SYSTEM_NAME) is not None:
+            info['name'] = self._text(values[self.SYSTEM_NAME])
+        
+        return info
+    
+    def _status_from_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the get_printer_status() dict from varbind values."""
+        device_status = values.get(self.PRINTER_STATUS)
+        pages = values.get(self.PRINTER_PAGES_PRINTED)
+        
+        return {
+            "status": self.DEVICE_STATUS_NAMES.get(device_status, "unknown"),
+            "pages_printed": pages if isinstance(pages, int) else None
+        }
+    
+    def _parse_supply_varbinds(self, varbinds: List[Any]) -> Dict[str, int]:
+        """Parse toner levels (percent) from a walk of prtMarkerSuppliesTable."""
+        prefix_len = len(self.SUPPLIES_OID) + 2  # leading and trailing dots
+        
+        # Group the table's cells by row index
+        rows: Dict[str, Dict[str, Any]] = {}
+        for vb in varbinds:
+            column, _, index = vb.oid[prefix_len:].partition('.')
+            rows.setdefault(index, {})[column] = vb.value
+        
+        supplies = {}
+        for row in rows.values():
+            description = self._text(row.get(self.SUPPLY_DESCRIPTION_COLUMN, b'')).lower()
+            if 'toner' not in description and 'supply' not in description:
+                continue
+            
+            level = row.get(self.SUPPLY_LEVEL_COLUMN)
+            max_capacity = row.get(self.SUPPLY_MAX_CAPACITY_COLUMN)
+            if not isinstance(level, int) or level < 0:
+                continue  # -2 = unknown, -3 = "some remaining"
+            if isinstance(max_capacity, int) and max_capacity > 0:
+                level = level * 100 // max_capacity
+            elif level > 100:
+                continue
+            
+            color = 'black'  # Default
+            for name in ('cyan', 'magenta', 'yellow'):
+                if name in description:
+                    color = name
+                    break
+            
+            supplies[color] = level
+        
+        return supplies
+    
+    # Text parsers for the net-snmp command line fallback
+    
+    def _parse_varbinds(self, snmp_output: str) -> Dict[str, str]:
+        """Split numeric-OID (-On) snmpget output into {oid: line}.
+        
+        Continuation lines of multi-line strings stay with their varbind;
+        OIDs the agent doesn't have are left out.
+        """
+        varbinds = {}
+        oid = None
+        
         for line in snmp_output.strip().split('\n'):
-            if '::sysDescr.0' in line:
-                info['description'] = line.split('= STRING: ', 1)[-1]
-            elif '::sysUpTimeInstance' in line:
-                info['uptime'] = line.split('= Timeticks: ', 1)[-1]
-            elif '::sysName.0' in line:
-                info['name'] = line.split('= STRING: ', 1)[-1]
+            if line.startswith('.') and ' = ' in line:
+                oid = line[1:line.index(' = ')]
+                if 'No Such' in line:
+                    oid = None
+                else:
+                    varbinds[oid] = line
+            elif oid is not None:
+                varbinds[oid] += '\n' + line
+        
+        return varbinds
+    
+    def _info_from_varbinds(self, varbinds: Dict[str, str]) -> Dict[str, Any]:
+        """Build the get_device_info() dict from _parse_varbinds() output."""
+        info = {}
+        
+        for key, oid in (
+            ('description', self.SYSTEM_DESCRIPTION),
+            ('uptime', self.SYSTEM_UPTIME),
+            ('name', self.SYSTEM_NAME)
+        ):
+            if oid in varbinds:
+                info[key] = varbinds[oid].split(': ', 1)[-1]
         
         return info
     
     def _parse_printer_status(self, snmp_output: str) -> str:
-        """Parse printer status from SNMP output."""
-        # This is a simplified parser - actual implementation would need
-        # to handle different status codes properly
-        if "1" in snmp_output:
-            return "idle"
-        elif "3" in snmp_output:
-            return "printing"
-        elif "4" in snmp_output:
-            return "warmup"
-        else:
+        """Parse printer status (hrDeviceStatus) from SNMP output."""
+        match = _SNMP_LINE_RE.search(snmp_output)
+        if match is None or match.group(2) != 'INTEGER':
+            return "unknown"
+        
+        # Printed as "running(2)" with MIBs loaded, or a bare "2" without
+        value = match.group(3).rpartition('(')[2].rstrip(')')
+        try:
+            return self.DEVICE_STATUS_NAMES.get(int(value), "unknown")
+        except ValueError:
             return "unknown"
     
     def _parse_pages_printed(self, snmp_output: str) -> Optional[int]:
         """Parse pages printed counter from SNMP output."""
+        # snmpget prints a single varbind, so the first counter is the one we asked for
+        head, marker, tail = snmp_output.partition('Counter32: ')
+        if not marker:
+            return None
         try:
-            # Extract number from SNMP output
-            for line in snmp_output.strip().split('\n'):
-                if 'Counter32:' in line:
-                    return int(line.split('Counter32: ')[-1])
-        except (ValueError, IndexError):
-            pass
-        return None
+            return int(tail.partition('\n')[0])
+        except ValueError:
+            return None
     
     def _parse_supply_levels(self, snmp_output: str) -> Dict[str, int]:
         """Parse supply levels from SNMP output."""
         supplies = {}
         
         # This is a simplified parser - actual implementation would need
-        # more sophisticated parsing based on the device's MIB
-        lines = snmp_output.strip().split('\n')
+        # more sophisticated parsing based on the device's MIB.
+        # A supply/toner line names the colour; the next percentage belongs to it.
+        current_color = None
         
-        for i, line in enumerate(lines):
-            if 'Supply' in line or 'Toner' in line:
+        for line in snmp_output.splitlines():
+            lower = line.lower()
+            if 'supply' in lower or 'toner' in lower:
+                current_color = next(
+                    (name for name in ('cyan', 'magenta', 'yellow') if name in lower),
+                    'black'
+                )
+            elif current_color is not None and 'INTEGER:' in line:
                 try:
-                    # Try to find a percentage value in subsequent lines
-                    for j in range(i, min(i+5, len(lines))):
-                        if 'INTEGER:' in lines[j]:
-                            level = int(lines[j].split('INTEGER: ')[-1])
-                            if 0 <= level <= 100:
-                                color = 'black'  # Default
-                                if 'cyan' in line.lower():
-                                    color = 'cyan'
-                                elif 'magenta' in line.lower():
-                                    color = 'magenta'
-                                elif 'yellow' in line.lower():
-                                    color = 'yellow'
-                                
-                                supplies[color] = level
-                                break
-                except (ValueError, IndexError):
+                    level = int(line.rpartition('INTEGER: ')[2])
+                except ValueError:
                     continue
+                if 0 <= level <= 100:
+                    supplies[current_color] = level
+                    current_color = None
         
         return supplies
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Configuration models."""
 
+from functools import cached_property, lru_cache
 from typing import Dict, Any, Optional, List, Tuple
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
@@ -28,6 +29,9 @@ class SNMPConfig(BaseModel):
     version: str = Field(default="2c")
     timeout: int = Field(default=5)
     retries: int = Field(default=3)
+    oid_batch_size: int = Field(default=5, description="Maximum OIDs per SNMP GET request")
+    max_repetitions: int = Field(default=10, description="GETBULK max-repetitions used when walking tables")
+    cache_ttl_seconds: float = Field(default=10.0, description="How long SNMP poll results are reused per device")
 
 
 class JobConfig(BaseModel):
@@ -64,6 +68,8 @@ class Settings(BaseSettings):
     machine_list: str = Field(default="", description="Comma-separated list of IP:PASSWORD pairs")
     discovery_network: str = Field(default="192.168.0.0/24", description="Network range for auto-discovery")
     discovery_timeout: int = Field(default=30, description="Discovery timeout in seconds")
+    discovery_concurrency: int = Field(default=32, description="Maximum hosts probed at once during discovery")
+    discovery_max_probes: int = Field(default=60, description="Maximum TCP liveness probes in flight when sweeping a network range")
     
     # Legacy Printer IPs (deprecated - use machine_list instead)
     printer_c654e_ip: str = Field(default="")
@@ -75,6 +81,9 @@ class Settings(BaseSettings):
     # SNMP
     snmp_community: str = Field(default="public")
     snmp_version: str = Field(default="2c")
+    snmp_oid_batch_size: int = Field(default=5, description="Maximum OIDs per SNMP GET request")
+    snmp_max_repetitions: int = Field(default=10, description="GETBULK max-repetitions used when walking tables")
+    snmp_cache_ttl: float = Field(default=10.0, description="How long SNMP poll results are reused per device (0 disables)")
     
     # Authentication
     api_key: str = Field(default="")
@@ -85,11 +94,13 @@ class Settings(BaseSettings):
     polling_endpoints: str = Field(default="")
     remote_api_key: str = Field(default="")
     remote_secret_key: str = Field(default="")
+    use_blake2: bool = Field(default=False, description="Sign remote requests with HMAC-BLAKE2b instead of HMAC-SHA256")
     
     # Jobs
     max_concurrent_jobs: int = Field(default=5)
     job_timeout_seconds: int = Field(default=300)
     retry_attempts: int = Field(default=3)
+    print_timeout: int = Field(default=30, description="Timeout in seconds for connecting to a direct print port")
     
     # Logging
     log_level: str = Field(default="INFO")
@@ -97,6 +108,14 @@ class Settings(BaseSettings):
     
     def parse_machine_list(self) -> List[Tuple[str, Optional[str]]]:
         """Parse machine list into IP and password pairs."""
+        return list(self.machines)
+    
+    @cached_property
+    def machines(self) -> Tuple[Tuple[str, Optional[str]], ...]:
+        """IP and password pairs from MACHINE_LIST (or the legacy settings), parsed once."""
+        return tuple(self._parse_machine_list())
+    
+    def _parse_machine_list(self) -> List[Tuple[str, Optional[str]]]:
         if not self.machine_list.strip():
             # Fallback to legacy individual printer settings
             machines = []
@@ -125,6 +144,14 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
+        # Immutable, so the cached machines property can never go stale
+        frozen = True
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Read settings from the environment and .env once per process."""
+    return Settings()
 
 
 class Config(BaseModel):
@@ -142,7 +169,7 @@ class Config(BaseModel):
     @classmethod
     def load(cls) -> "Config":
         """Load configuration from environment and defaults."""
-        settings = Settings()
+        settings = get_settings()
         
         return cls(
             database=DatabaseConfig(url=settings.database_url),
@@ -153,7 +180,10 @@ class Config(BaseModel):
             ),
             snmp=SNMPConfig(
                 community=settings.snmp_community,
-                version=settings.snmp_version
+                version=settings.snmp_version,
+                oid_batch_size=settings.snmp_oid_batch_size,
+                max_repetitions=settings.snmp_max_repetitions,
+                cache_ttl_seconds=settings.snmp_cache_ttl
             ),
             jobs=JobConfig(
                 max_concurrent_jobs=settings.max_concurrent_jobs,
@@ -1,5 +1,6 @@
 """Device models for printer management."""
 
+import ipaddress
 from enum import Enum
 from typing import Optional, Dict, Any
 from datetime import datetime
@@ -70,9 +71,9 @@ class Device(BaseModel):
     @validator('ip_address')
     def validate_ip_address(cls, v):
         """Validate IP address format."""
-        import re
-        ip_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        if not re.match(ip_pattern, v):
+        try:
+            ipaddress.IPv4Address(v)
+        except ValueError:
             raise ValueError('Invalid IP address format')
         return v
     
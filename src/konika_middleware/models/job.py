@@ -1,11 +1,14 @@
 """Print job models."""
 
 from enum import Enum
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Literal
 from datetime import datetime
 from pydantic import BaseModel, Field, validator
 
 
+_ORIENTATIONS = frozenset({"portrait", "landscape"})
+
+
 class JobStatus(str, Enum):
     """Print job status states."""
     PENDING = "pending"
@@ -17,6 +20,12 @@ class JobStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# JobStatus values as a plain string type: PrintJob only ever stores the value, and
+# pydantic checks a Literal with one set lookup instead of an enum round-trip.
+# JobStatus members still compare equal and are accepted as input.
+JobStatusValue = Literal["pending", "queued", "processing", "printing", "completed", "failed", "cancelled"]
+
+
 class PaperSize(str, Enum):
     """Supported paper sizes."""
     A4 = "A4"
@@ -74,9 +83,10 @@ class PrintSettings(BaseModel):
     @validator('orientation')
     def validate_orientation(cls, v):
         """Validate orientation values."""
-        if v.lower() not in ['portrait', 'landscape']:
+        orientation = v.lower()
+        if orientation not in _ORIENTATIONS:
             raise ValueError('Orientation must be portrait or landscape')
-        return v.lower()
+        return orientation
 
 
 class PrintJob(BaseModel):
@@ -84,7 +94,7 @@ class PrintJob(BaseModel):
     
     id: str = Field(..., description="Unique job identifier")
     title: str = Field(..., description="Job title/name")
-    status: JobStatus = Field(default=JobStatus.PENDING, description="Current job status")
+    status: JobStatusValue = Field(default=JobStatus.PENDING.value, description="Current job status")
     
     # Job source
     user_id: Optional[str] = Field(None, description="User who submitted the job")
@@ -124,9 +134,6 @@ class PrintJob(BaseModel):
     class Config:
         """Pydantic configuration."""
         use_enum_values = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
 
 
 class PrintJobRequest(BaseModel):
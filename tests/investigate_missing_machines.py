@@ -6,10 +6,25 @@ This will test various connection methods and protocols.
 
 import asyncio
 import aiohttp
-import socket
-import subprocess
 from typing import Dict, Any, List
 
+from src.konika_middleware.devices.snmp_client import SNMPClient
+
+
+async def _probe_port(ip: str, port: int, timeout: float) -> bool:
+    """Return True if a TCP connection to ip:port succeeds within timeout."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
 
 async def basic_connectivity_test(ip: str, model: str) -> Dict[str, Any]:
     """Test basic network connectivity."""
@@ -20,14 +35,24 @@ async def basic_connectivity_test(ip: str, model: str) -> Dict[str, Any]:
     
     # Ping test
     try:
-        result = subprocess.run(['ping', '-c', '3', ip], 
-                              capture_output=True, text=True, timeout=10)
-        ping_success = result.returncode == 0
+        # Run ping without blocking the event loop, so other machines keep being probed
+        process = await asyncio.create_subprocess_exec(
+            'ping', '-c', '3', ip,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=10)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        ping_success = process.returncode == 0
         print(f"Ping: {'✅ Success' if ping_success else '❌ Failed'}")
         results['ping'] = ping_success
         if ping_success:
             # Extract ping times
-            lines = result.stdout.split('\n')
+            lines = stdout.decode(errors='replace').split('\n')
             for line in lines:
                 if 'time=' in line:
                     print(f"  {line.strip()}")
@@ -40,17 +65,12 @@ async def basic_connectivity_test(ip: str, model: str) -> Dict[str, Any]:
     open_ports = []
     
     print(f"\nPort Scanning:")
-    for port in common_ports:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        try:
-            result = sock.connect_ex((ip, port))
-            if result == 0:
-                open_ports.append(port)
-                print(f"  Port {port}: ✅ Open")
-            sock.close()
-        except Exception:
-            pass
+    # All ports are probed at once, so the scan takes one timeout rather than one per port
+    port_open = await asyncio.gather(*[_probe_port(ip, port, 2) for port in common_ports])
+    for port, is_open in zip(common_ports, port_open):
+        if is_open:
+            open_ports.append(port)
+            print(f"  Port {port}: ✅ Open")
     
     results['open_ports'] = open_ports
     print(f"Open ports: {open_ports}")
@@ -58,13 +78,41 @@ async def basic_connectivity_test(ip: str, model: str) -> Dict[str, Any]:
     return results
 
 
-async def http_deep_scan(ip: str, model: str) -> Dict[str, Any]:
+async def _probe_path(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                      ip: str, path: str) -> Dict[str, Any]:
+    """Fetch one HTTP path; returns its details if the printer answered meaningfully, else None."""
+    async with semaphore:
+        try:
+            url = f"http://{ip}{path}"
+            async with session.get(url) as response:
+                if response.status not in [200, 301, 302, 401, 403]:
+                    return None
+                
+                found = {
+                    'path': path,
+                    'status': response.status,
+                    'content_type': response.headers.get('content-type', 'unknown'),
+                    'server': response.headers.get('server', 'unknown')
+                }
+                
+                # Get a sample of content for analysis
+                if response.status == 200:
+                    content = await response.text()
+                    found['content_sample'] = content[:200].replace('\n', ' ').replace('\r', '')
+                
+                return found
+        
+        except Exception:
+            # Silently continue - too many paths to show all errors
+            return None
+
+
+async def http_deep_scan(session: aiohttp.ClientSession, ip: str, model: str) -> Dict[str, Any]:
     """Deep HTTP scanning with various paths and methods."""
     print(f"\n🌐 HTTP DEEP SCAN - {model} ({ip})")
     print("-" * 50)
     
     results = {}
-    timeout = aiohttp.ClientTimeout(total=10)
     
     # Test various HTTP paths that printers commonly use
     test_paths = [
@@ -97,29 +145,18 @@ async def http_deep_scan(ip: str, model: str) -> Dict[str, Any]:
     accessible_paths = []
     
     try:
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            for path in test_paths:
-                try:
-                    url = f"http://{ip}{path}"
-                    async with session.get(url) as response:
-                        if response.status in [200, 301, 302, 401, 403]:
-                            accessible_paths.append({
-                                'path': path,
-                                'status': response.status,
-                                'content_type': response.headers.get('content-type', 'unknown'),
-                                'server': response.headers.get('server', 'unknown')
-                            })
-                            print(f"  {path}: {response.status} - {response.headers.get('content-type', 'unknown')}")
-                            
-                            # Get a sample of content for analysis
-                            if response.status == 200:
-                                content = await response.text()
-                                content_sample = content[:200].replace('\n', ' ').replace('\r', '')
-                                print(f"    Content: {content_sample}...")
-                                
-                except Exception as e:
-                    # Silently continue - too many paths to show all errors
-                    pass
+        # Probe paths concurrently, but no more than 8 at a time to go easy on the printer
+        semaphore = asyncio.Semaphore(8)
+        found = await asyncio.gather(*[_probe_path(session, semaphore, ip, path) for path in test_paths])
+        
+        for entry in found:
+            if entry is None:
+                continue
+            content_sample = entry.pop('content_sample', None)
+            accessible_paths.append(entry)
+            print(f"  {entry['path']}: {entry['status']} - {entry['content_type']}")
+            if content_sample is not None:
+                print(f"    Content: {content_sample}...")
     
     except Exception as e:
         print(f"HTTP scan error: {e}")
@@ -140,29 +177,44 @@ async def snmp_detailed_test(ip: str, model: str) -> Dict[str, Any]:
     # Test different SNMP communities
     communities = ['public', 'private', 'admin', 'printer', '', 'konica', 'minolta']
     
-    for community in communities:
-        try:
-            from src.konika_middleware.devices.snmp_client import SNMPClient
-            snmp_client = SNMPClient(ip, community)
-            device_info = await snmp_client.get_device_info()
-            
-            if device_info:
-                print(f"✅ SNMP Success with community: '{community}'")
-                print(f"   Description: {device_info.get('description', 'Unknown')}")
-                print(f"   Contact: {device_info.get('contact', 'Unknown')}")
-                print(f"   Location: {device_info.get('location', 'Unknown')}")
-                results[f'snmp_{community}'] = device_info
-                break
-            else:
-                print(f"❌ SNMP Failed with community: '{community}'")
+    # Try every community at once and stop at the first one the printer answers
+    clients = {community: SNMPClient(ip, community) for community in communities}
+    tasks = {
+        asyncio.create_task(client.get_device_info()): community
+        for community, client in clients.items()
+    }
+    pending = set(tasks)
+    
+    try:
+        while pending and not results:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                community = tasks[task]
+                try:
+                    device_info = task.result()
+                except Exception as e:
+                    print(f"❌ SNMP Error with community '{community}': {e}")
+                    continue
                 
-        except Exception as e:
-            print(f"❌ SNMP Error with community '{community}': {e}")
+                if device_info and not results:
+                    print(f"✅ SNMP Success with community: '{community}'")
+                    print(f"   Description: {device_info.get('description', 'Unknown')}")
+                    print(f"   Contact: {device_info.get('contact', 'Unknown')}")
+                    print(f"   Location: {device_info.get('location', 'Unknown')}")
+                    results[f'snmp_{community}'] = device_info
+                elif not device_info:
+                    print(f"❌ SNMP Failed with community: '{community}'")
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for client in clients.values():
+            client.close()
     
     return results
 
 
-async def printer_protocol_test(ip: str, model: str) -> Dict[str, Any]:
+async def printer_protocol_test(session: aiohttp.ClientSession, ip: str, model: str) -> Dict[str, Any]:
     """Test various printer protocols."""
     print(f"\n🖨️  PRINTER PROTOCOL TEST - {model} ({ip})")
     print("-" * 50)
@@ -179,31 +231,26 @@ async def printer_protocol_test(ip: str, model: str) -> Dict[str, Any]:
         ]
         
         timeout = aiohttp.ClientTimeout(total=5)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            for ipp_url in ipp_urls:
-                try:
-                    async with session.get(ipp_url) as response:
-                        if response.status in [200, 401]:
-                            print(f"✅ IPP accessible: {ipp_url} ({response.status})")
-                            results['ipp_accessible'] = True
-                            break
-                except Exception:
-                    continue
+        for ipp_url in ipp_urls:
+            try:
+                async with session.get(ipp_url, timeout=timeout) as response:
+                    if response.status in [200, 401]:
+                        print(f"✅ IPP accessible: {ipp_url} ({response.status})")
+                        results['ipp_accessible'] = True
+                        break
+            except Exception:
+                continue
     except Exception as e:
         print(f"IPP test error: {e}")
     
     # Test raw printing port
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(3)
-        result = sock.connect_ex((ip, 9100))
-        if result == 0:
+        if await _probe_port(ip, 9100, 3):
             print(f"✅ Raw printing port (9100) is open")
             results['raw_print_port'] = True
         else:
             print(f"❌ Raw printing port (9100) is closed")
             results['raw_print_port'] = False
-        sock.close()
     except Exception as e:
         print(f"Raw port test error: {e}")
     
@@ -215,11 +262,13 @@ async def investigate_machine(ip: str, model: str):
     print(f"\n🔍 INVESTIGATING {model} AT {ip}")
     print("=" * 60)
     
-    # Run all tests
-    connectivity = await basic_connectivity_test(ip, model)
-    http_results = await http_deep_scan(ip, model)
-    snmp_results = await snmp_detailed_test(ip, model)
-    printer_results = await printer_protocol_test(ip, model)
+    # Run all tests; the HTTP-based ones share one session and its connection pool
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10), connector=connector) as session:
+        connectivity = await basic_connectivity_test(ip, model)
+        http_results = await http_deep_scan(session, ip, model)
+        snmp_results = await snmp_detailed_test(ip, model)
+        printer_results = await printer_protocol_test(session, ip, model)
     
     # Summary
     print(f"\n📊 INVESTIGATION SUMMARY - {model}")
@@ -255,12 +304,16 @@ async def main():
     
     all_results = {}
     
-    for ip, model in missing_machines:
-        try:
-            results = await investigate_machine(ip, model)
+    # Investigate all machines at once; their progress output will interleave
+    outcomes = await asyncio.gather(
+        *[investigate_machine(ip, model) for ip, model in missing_machines],
+        return_exceptions=True
+    )
+    for (ip, model), results in zip(missing_machines, outcomes):
+        if isinstance(results, Exception):
+            print(f"❌ Investigation failed for {model}: {results}")
+        else:
             all_results[model] = results
-        except Exception as e:
-            print(f"❌ Investigation failed for {model}: {e}")
     
     # Final analysis
     print(f"\n\n🧪 FINAL ANALYSIS")
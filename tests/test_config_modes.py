@@ -10,6 +10,9 @@ from src.konika_middleware.models.config import Settings
 from src.konika_middleware.core.device_manager import DeviceManager
 
 
+logger = logging.getLogger(__name__)
+
+
 async def test_predefined_mode():
     """Test predefined machine list mode (AUTO_DISCOVER=false)."""
     print("🔧 TESTING PREDEFINED MACHINE LIST MODE")
@@ -123,9 +126,7 @@ async def main():
         print("  • Legacy individual settings still supported for backwards compatibility")
         
     except Exception as e:
-        print(f"❌ TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ TEST FAILED: {e}")
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 """Test script to check device connectivity."""
 
 import asyncio
+import logging
 import sys
 import os
 
@@ -9,16 +10,19 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from konika_middleware.models.device import Device, DeviceType
-from konika_middleware.models.config import Settings
+from konika_middleware.models.config import get_settings
 from konika_middleware.devices.km_c654e import KMC654eAdapter
 
 
+logger = logging.getLogger(__name__)
+
+
 async def test_c654e_connection():
     """Test connection to KM C654e device."""
     print("Testing Konica Minolta C654e connection...")
     
     # Load settings
-    settings = Settings()
+    settings = get_settings()
     
     # Create device object
     device = Device(
@@ -71,9 +75,7 @@ async def test_c654e_connection():
         print("Test completed successfully!")
         
     except Exception as e:
-        print(f"Error during testing: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error during testing: {e}")
 
 
 async def main():
@@ -85,6 +87,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -2,6 +2,7 @@
 """Test script for device discovery and remote communication."""
 
 import asyncio
+import logging
 import sys
 import os
 import json
@@ -10,10 +11,13 @@ import json
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from konika_middleware.core.discovery import NetworkDiscovery
-from konika_middleware.models.config import Settings
+from konika_middleware.models.config import get_settings
 from konika_middleware.core.remote_client import RemoteClient
 
 
+logger = logging.getLogger(__name__)
+
+
 async def test_device_discovery():
     """Test the device discovery functionality."""
     print("=" * 60)
@@ -21,7 +25,7 @@ async def test_device_discovery():
     print("=" * 60)
     
     # Create discovery instance
-    settings = Settings()
+    settings = get_settings()
     discovery = NetworkDiscovery(settings.snmp_community)
     
     print(f"Testing with SNMP community: {settings.snmp_community}")
@@ -80,7 +84,7 @@ async def test_network_scan():
         print("Skipping network scan")
         return []
     
-    settings = Settings()
+    settings = get_settings()
     discovery = NetworkDiscovery(settings.snmp_community)
     
     print("Starting network scan...")
@@ -104,7 +108,7 @@ async def test_remote_communication():
     print("TESTING REMOTE COMMUNICATION")
     print("=" * 60)
     
-    settings = Settings()
+    settings = get_settings()
     remote_client = RemoteClient(settings)
     
     # Test webhook configuration
@@ -252,13 +256,13 @@ async def main():
         print(f"✓ Ready for production use!")
         
     except Exception as e:
-        print(f"\\n❌ TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ TEST FAILED: {e}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
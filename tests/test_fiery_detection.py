@@ -5,9 +5,67 @@ Test script to detect and test Fiery controllers on C759 and C754e.
 
 import asyncio
 import logging
+from typing import List
 from src.konika_middleware.devices.fiery_client import FieryClient
 from src.konika_middleware.core.discovery import NetworkDiscovery
-from src.konika_middleware.models.config import Settings
+from src.konika_middleware.models.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _probe_fiery(ip: str, model: str, password: str) -> List[str]:
+    """Run the Fiery checks against one machine; returns the report lines."""
+    out = []
+    out.append(f"\n🖨️  Testing {model} at {ip}")
+    out.append("-" * 30)
+    
+    # Create Fiery client
+    fiery_client = FieryClient(ip, password=password)
+    
+    # Test Fiery detection
+    try:
+        detection_result = await fiery_client.detect_fiery()
+        
+        out.append(f"Fiery Detected: {'✅ Yes' if detection_result['is_fiery'] else '❌ No'}")
+        
+        if detection_result['is_fiery']:
+            out.append(f"Fiery Type: {detection_result.get('fiery_type', 'Unknown')}")
+            out.append(f"Version: {detection_result.get('version', 'Unknown')}")
+            out.append(f"Model: {detection_result.get('model', 'Unknown')}")
+            out.append(f"Accessible Endpoints: {detection_result.get('accessible_endpoints', [])}")
+            
+            # Test authentication
+            out.append("\n🔐 Testing Fiery Authentication...")
+            auth_success = await fiery_client.authenticate()
+            out.append(f"Authentication: {'✅ Success' if auth_success else '❌ Failed'}")
+            
+            # Test status
+            out.append("\n📊 Testing Fiery Status...")
+            status = await fiery_client.get_status()
+            out.append(f"Status: {status.get('status', 'Unknown')}")
+            out.append(f"Ready: {'✅ Yes' if status.get('ready') else '❌ No'}")
+            out.append(f"Jobs Pending: {status.get('jobs_pending', 0)}")
+            
+            # Test capabilities
+            out.append("\n⚙️  Testing Fiery Capabilities...")
+            capabilities = await fiery_client.get_capabilities()
+            out.append(f"Color Support: {'✅' if capabilities.get('supports_color') else '❌'}")
+            out.append(f"Duplex Support: {'✅' if capabilities.get('supports_duplex') else '❌'}")
+            out.append(f"RIP Processing: {'✅' if capabilities.get('rip_processing') else '❌'}")
+            out.append(f"Supported Formats: {capabilities.get('supported_formats', [])}")
+            
+        else:
+            out.append("❌ No Fiery controller detected")
+            if detection_result.get('error'):
+                out.append(f"Error: {detection_result['error']}")
+                
+    except Exception as e:
+        out.append(f"❌ Fiery detection failed: {e}")
+    finally:
+        await fiery_client.close()
+    
+    return out
 
 
 async def test_fiery_detection():
@@ -21,52 +79,12 @@ async def test_fiery_detection():
         ("192.168.1.220", "C754e", "12345678")
     ]
     
-    for ip, model, password in fiery_machines:
-        print(f"\n🖨️  Testing {model} at {ip}")
-        print("-" * 30)
-        
-        # Create Fiery client
-        fiery_client = FieryClient(ip, password=password)
-        
-        # Test Fiery detection
-        try:
-            detection_result = await fiery_client.detect_fiery()
-            
-            print(f"Fiery Detected: {'✅ Yes' if detection_result['is_fiery'] else '❌ No'}")
-            
-            if detection_result['is_fiery']:
-                print(f"Fiery Type: {detection_result.get('fiery_type', 'Unknown')}")
-                print(f"Version: {detection_result.get('version', 'Unknown')}")
-                print(f"Model: {detection_result.get('model', 'Unknown')}")
-                print(f"Accessible Endpoints: {detection_result.get('accessible_endpoints', [])}")
-                
-                # Test authentication
-                print("\n🔐 Testing Fiery Authentication...")
-                auth_success = await fiery_client.authenticate()
-                print(f"Authentication: {'✅ Success' if auth_success else '❌ Failed'}")
-                
-                # Test status
-                print("\n📊 Testing Fiery Status...")
-                status = await fiery_client.get_status()
-                print(f"Status: {status.get('status', 'Unknown')}")
-                print(f"Ready: {'✅ Yes' if status.get('ready') else '❌ No'}")
-                print(f"Jobs Pending: {status.get('jobs_pending', 0)}")
-                
-                # Test capabilities
-                print("\n⚙️  Testing Fiery Capabilities...")
-                capabilities = await fiery_client.get_capabilities()
-                print(f"Color Support: {'✅' if capabilities.get('supports_color') else '❌'}")
-                print(f"Duplex Support: {'✅' if capabilities.get('supports_duplex') else '❌'}")
-                print(f"RIP Processing: {'✅' if capabilities.get('rip_processing') else '❌'}")
-                print(f"Supported Formats: {capabilities.get('supported_formats', [])}")
-                
-            else:
-                print("❌ No Fiery controller detected")
-                if detection_result.get('error'):
-                    print(f"Error: {detection_result['error']}")
-                    
-        except Exception as e:
-            print(f"❌ Fiery detection failed: {e}")
+    # Machines are checked concurrently; each report is printed in one piece
+    reports = await asyncio.gather(*[
+        _probe_fiery(ip, model, password) for ip, model, password in fiery_machines
+    ])
+    for report in reports:
+        print("\n".join(report))
 
 
 async def test_enhanced_discovery():
@@ -74,8 +92,8 @@ async def test_enhanced_discovery():
     print("\n\n🔍 TESTING ENHANCED DISCOVERY WITH FIERY SUPPORT")
     print("=" * 60)
     
-    settings = Settings()
-    discovery = NetworkDiscovery(settings.snmp_community)
+    settings = get_settings()
+    discovery = NetworkDiscovery(settings.snmp_community, settings.discovery_concurrency)
     
     # Test all your machines
     test_ips = ["192.168.1.200", "192.168.1.210", "192.168.1.220", "192.168.1.131"]
@@ -106,38 +124,40 @@ async def test_device_manager_with_fiery():
     print("=" * 55)
     
     from src.konika_middleware.core.device_manager import DeviceManager
-    from src.konika_middleware.models.config import Settings
     
-    settings = Settings()
+    settings = get_settings()
     device_manager = DeviceManager(settings)
     
-    print("Starting device discovery with Fiery support...")
-    devices = await device_manager.discover_devices()
-    
-    print(f"\nDevice manager found {len(devices)} devices:")
-    
-    for device in devices:
-        print(f"\n🖨️  {device.name} ({device.id})")
-        print(f"    IP: {device.ip_address}")
-        print(f"    Type: {device.type}")
-        print(f"    Password: {'✅' if device.admin_password else '❌'}")
+    try:
+        print("Starting device discovery with Fiery support...")
+        devices = await device_manager.discover_devices()
         
-        # Test device adapter
-        try:
-            adapter = await device_manager._get_device_adapter(device)
-            print(f"    Adapter: {adapter.__class__.__name__}")
-            
-            # Test connection
-            connection_test = await adapter.test_connection()
-            print(f"    Connection Test: {'✅' if connection_test.get('status') == 'success' else '❌'}")
-            
-            if connection_test.get('fiery_detected'):
-                print(f"    Fiery Detected: ✅")
-                print(f"    Fiery Type: {connection_test.get('fiery_type', 'Unknown')}")
-                print(f"    Controller Status: {connection_test.get('controller_status', 'Unknown')}")
+        print(f"\nDevice manager found {len(devices)} devices:")
+        
+        for device in devices:
+            print(f"\n🖨️  {device.name} ({device.id})")
+            print(f"    IP: {device.ip_address}")
+            print(f"    Type: {device.type}")
+            print(f"    Password: {'✅' if device.admin_password else '❌'}")
             
-        except Exception as e:
-            print(f"    Adapter Error: {e}")
+            # Test device adapter
+            try:
+                adapter = await device_manager._get_device_adapter(device)
+                print(f"    Adapter: {adapter.__class__.__name__}")
+                
+                # Test connection
+                connection_test = await adapter.test_connection()
+                print(f"    Connection Test: {'✅' if connection_test.get('status') == 'success' else '❌'}")
+                
+                if connection_test.get('fiery_detected'):
+                    print(f"    Fiery Detected: ✅")
+                    print(f"    Fiery Type: {connection_test.get('fiery_type', 'Unknown')}")
+                    print(f"    Controller Status: {connection_test.get('controller_status', 'Unknown')}")
+                
+            except Exception as e:
+                print(f"    Adapter Error: {e}")
+    finally:
+        await device_manager.stop()
 
 
 async def main():
@@ -152,17 +172,19 @@ async def main():
     print()
     
     try:
-        await test_fiery_detection()
-        await test_enhanced_discovery()
-        await test_device_manager_with_fiery()
+        # The three phases are independent, so run them together. The first failure
+        # propagates; asyncio.run() cancels whatever is still running on exit.
+        await asyncio.gather(
+            test_fiery_detection(),
+            test_enhanced_discovery(),
+            test_device_manager_with_fiery()
+        )
         
         print("\n\n✅ FIERY TESTING COMPLETE!")
         print("If Fiery controllers were detected, your C759 and C754e should now work properly.")
         
     except Exception as e:
-        print(f"\n❌ FIERY TESTING FAILED: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ FIERY TESTING FAILED: {e}")
 
 
 if __name__ == "__main__":
@@ -6,14 +6,91 @@ This will test each machine individually and then test the full middleware.
 
 import asyncio
 import aiohttp
+import functools
+import io
 import logging
-from src.konika_middleware.models.config import Settings
+import sys
+from contextlib import redirect_stdout
+from types import MappingProxyType
+from yarl import URL
+from typing import Any, Dict, List, Optional, Tuple
+from src.konika_middleware.models.config import Config, get_settings
+from src.konika_middleware.models.device import Device
 from src.konika_middleware.core.device_manager import DeviceManager
 from src.konika_middleware.core.discovery import NetworkDiscovery
 from src.konika_middleware.devices.snmp_client import SNMPClient
 
 
-async def test_basic_connectivity():
+logger = logging.getLogger(__name__)
+
+# Browser-like cookies the WCD login page expects
+_BASE_COOKIES = MappingProxyType({
+    'bv': 'Chrome/138.0.0.0',
+    'uatype': 'NN',
+    'lang': 'En',
+    'favmode': 'false',
+    'vm': 'Html',
+    'param': '',
+    'access': '',
+    'bm': 'Low',
+    'selno': 'En'
+})
+
+
+def _buffered(test):
+    """Collect a test's printed report in memory and write it to stdout in one go."""
+    @functools.wraps(test)
+    async def run(*args, **kwargs):
+        buf = io.StringIO()
+        try:
+            with redirect_stdout(buf):
+                return await test(*args, **kwargs)
+        finally:
+            sys.stdout.write(buf.getvalue())
+            sys.stdout.flush()
+    return run
+
+
+def make_session() -> aiohttp.ClientSession:
+    """One pooled HTTP session shared by all the HTTP tests in a run."""
+    connector = aiohttp.TCPConnector(limit=50, limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=30)
+    return aiohttp.ClientSession(
+        connector=connector,
+        # Printers are addressed by IP, which the default jar refuses to store cookies for
+        cookie_jar=aiohttp.CookieJar(unsafe=True),
+        timeout=aiohttp.ClientTimeout(total=5, connect=2)
+    )
+
+
+async def _alive(ip: str, ports: Tuple[int, ...] = (80, 9100), timeout: float = 0.3) -> bool:
+    """Cheap liveness check: does the host accept a TCP connection on any of ``ports``?
+    
+    Printers always listen on 9100 even when the web server is off, so SNMP-only
+    devices still count as alive.
+    """
+    async def connect(port: int) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+    
+    return any(await asyncio.gather(*[connect(port) for port in ports]))
+
+
+async def _probe_http(session: aiohttp.ClientSession, ip: str) -> Tuple[Dict[str, Any], str]:
+    """GET the printer's home page; returns the result entry and the line to print."""
+    try:
+        async with session.get(f"http://{ip}") as response:
+            http_status = response.status
+            return {"http": http_status, "accessible": True}, f"  ✅ HTTP: {http_status}"
+    except Exception as e:
+        return {"http": "failed", "accessible": False, "error": str(e)}, f"  ❌ HTTP: Failed - {e}"
+
+
+@_buffered
+async def test_basic_connectivity(session: aiohttp.ClientSession):
     """Test basic HTTP connectivity to each machine."""
     print("🔌 TESTING BASIC CONNECTIVITY")
     print("=" * 50)
@@ -26,40 +103,49 @@ async def test_basic_connectivity():
     ]
     
     results = {}
-    timeout = aiohttp.ClientTimeout(total=5)
     
-    for ip, model in machines:
+    # Only spend an HTTP timeout on machines that answer a quick connect
+    alive = await asyncio.gather(*[_alive(ip) for ip, model in machines])
+    
+    async def probe(ip: str, is_alive: bool) -> Tuple[Dict[str, Any], str]:
+        if not is_alive:
+            error = "host did not accept a TCP connection"
+            return {"http": "failed", "accessible": False, "error": error}, f"  ❌ HTTP: Failed - {error}"
+        return await _probe_http(session, ip)
+    
+    # Probe all machines at once, then report in order
+    outcomes = await asyncio.gather(*[probe(ip, is_alive) for (ip, model), is_alive in zip(machines, alive)])
+    
+    for (ip, model), (result, line) in zip(machines, outcomes):
         print(f"Testing {model} at {ip}...")
-        
-        try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Test basic HTTP connectivity
-                async with session.get(f"http://{ip}") as response:
-                    http_status = response.status
-                    print(f"  ✅ HTTP: {http_status}")
-                    results[ip] = {"http": http_status, "accessible": True}
-                    
-        except Exception as e:
-            print(f"  ❌ HTTP: Failed - {e}")
-            results[ip] = {"http": "failed", "accessible": False, "error": str(e)}
+        print(line)
+        results[ip] = result
     
     print()
     return results
 
 
+@_buffered
 async def test_snmp_discovery():
     """Test SNMP discovery on your actual machines."""
     print("📡 TESTING SNMP DISCOVERY")
     print("=" * 50)
     
-    settings = Settings()
+    settings = get_settings()
     discovery = NetworkDiscovery(settings.snmp_community)
     
     # Test specific IPs from your config
     machines = ["192.168.1.200", "192.168.1.210", "192.168.1.220", "192.168.1.131"]
     
+    # Skip the SNMP timeout for machines that are not on the network at all
+    alive = await asyncio.gather(*[_alive(ip) for ip in machines])
+    alive_ips = [ip for ip, is_alive in zip(machines, alive) if is_alive]
+    for ip, is_alive in zip(machines, alive):
+        if not is_alive:
+            print(f"  ⏭️  {ip} is not reachable, skipping")
+    
     print("Scanning your specific machines via SNMP...")
-    discovered = await discovery.quick_scan(machines)
+    discovered = await discovery.quick_scan(alive_ips)
     
     print(f"Found {len(discovered)} KM devices:")
     for device_info in discovered:
@@ -73,13 +159,14 @@ async def test_snmp_discovery():
     return discovered
 
 
-async def test_device_manager():
+@_buffered
+async def test_device_manager() -> Tuple[DeviceManager, List[Device]]:
     """Test the full device manager with your configuration."""
     print("🔧 TESTING DEVICE MANAGER")
     print("=" * 50)
     
     # Load your settings
-    settings = Settings()
+    settings = get_settings()
     print(f"Using configuration:")
     print(f"  AUTO_DISCOVER: {settings.auto_discover}")
     print(f"  MACHINE_LIST: {settings.machine_list}")
@@ -109,84 +196,78 @@ async def test_device_manager():
         for device in devices:
             print(f"  {device.name}: {device.status}")
     
-    return devices
+    return device_manager, devices
 
 
-async def test_individual_device_connections():
+async def _probe_login(session: aiohttp.ClientSession, ip: str, password: Optional[str]) -> str:
+    """Try the WCD admin login; returns the line to print."""
+    try:
+        # Test admin login
+        printer_url = URL(f"http://{ip}/")
+        session.cookie_jar.update_cookies(_BASE_COOKIES, printer_url)
+        
+        login_data = {
+            'func': 'PSL_LP1_LOG',
+            'password': password or ''
+        }
+        
+        timeout = aiohttp.ClientTimeout(total=10)
+        url = f"http://{ip}/wcd/login.cgi"
+        async with session.post(url, data=login_data, timeout=timeout) as response:
+            if response.status in [200, 302]:
+                # Check for admin cookies set by this printer only, then drop them so
+                # the shared jar doesn't grow with every machine
+                cookies = session.cookie_jar.filter_cookies(printer_url)
+                has_admin_session = any(name.startswith('ID') for name in cookies)
+                session.cookie_jar.clear_domain(ip)
+                
+                if has_admin_session or response.status == 302:
+                    return f"  ✅ Authentication successful"
+                return f"  ⚠️  HTTP {response.status} but no admin session detected"
+            return f"  ❌ Authentication failed: HTTP {response.status}"
+    
+    except Exception as e:
+        return f"  ❌ Connection failed: {e}"
+
+
+@_buffered
+async def test_individual_device_connections(session: aiohttp.ClientSession):
     """Test individual device connections and authentication."""
     print("🔐 TESTING INDIVIDUAL DEVICE AUTHENTICATION")
     print("=" * 50)
     
-    settings = Settings()
+    settings = get_settings()
     machines = settings.parse_machine_list()
     
-    for ip, password in machines:
+    # Log in to all machines at once, then report in order
+    outcomes = await asyncio.gather(*[_probe_login(session, ip, password) for ip, password in machines])
+    
+    for (ip, password), line in zip(machines, outcomes):
         print(f"Testing authentication for {ip}...")
-        
-        try:
-            # Test admin login
-            base_cookies = {
-                'bv': 'Chrome/138.0.0.0',
-                'uatype': 'NN',
-                'lang': 'En',
-                'favmode': 'false',
-                'vm': 'Html',
-                'param': '',
-                'access': '',
-                'bm': 'Low',
-                'selno': 'En'
-            }
-            
-            login_data = {
-                'func': 'PSL_LP1_LOG',
-                'password': password or ''
-            }
-            
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(cookies=base_cookies, timeout=timeout) as session:
-                url = f"http://{ip}/wcd/login.cgi"
-                async with session.post(url, data=login_data) as response:
-                    if response.status in [200, 302]:
-                        # Check for admin cookies
-                        cookies = dict(session.cookie_jar)
-                        has_admin_session = any('ID' in str(cookie) for cookie in cookies)
-                        
-                        if has_admin_session or response.status == 302:
-                            print(f"  ✅ Authentication successful")
-                        else:
-                            print(f"  ⚠️  HTTP {response.status} but no admin session detected")
-                    else:
-                        print(f"  ❌ Authentication failed: HTTP {response.status}")
-                        
-        except Exception as e:
-            print(f"  ❌ Connection failed: {e}")
-        
+        print(line)
         print()
 
 
-async def test_middleware_startup():
-    """Test if the middleware can start successfully."""
+@_buffered
+async def test_middleware_startup(device_manager: DeviceManager, devices: List[Device]):
+    """Test if the middleware can start successfully.
+    
+    Reuses the device manager and devices from test_device_manager() rather than
+    running discovery and the status refresh a second time.
+    """
     print("🚀 TESTING MIDDLEWARE STARTUP")
     print("=" * 50)
     
     try:
-        # Import and test configuration loading
-        from src.konika_middleware.models.config import Config
-        config = Config.load()
+        # Test configuration loading
+        Config.load()
         print("✅ Configuration loaded successfully")
         
-        # Test device manager initialization
-        device_manager = DeviceManager(config.settings)
-        print("✅ Device manager created successfully")
-        
-        # Test device discovery
-        devices = await device_manager.discover_devices()
-        print(f"✅ Device discovery completed: {len(devices)} devices found")
-        
-        # Test device status refresh
+        # Device manager, discovery and refresh were exercised by the device manager test
+        print("✅ Device manager reused from the device manager test")
+        print(f"✅ Device discovery reused: {len(devices)} devices found")
         if devices:
-            await device_manager.refresh_all_devices()
-            print("✅ Device status refresh completed")
+            print(f"✅ Device status refresh reused ({len(device_manager.get_online_devices())} online)")
         
         print()
         print("🎉 MIDDLEWARE IS READY TO START!")
@@ -195,9 +276,7 @@ async def test_middleware_startup():
         return True
         
     except Exception as e:
-        print(f"❌ Middleware startup test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Middleware startup test failed: {e}")
         return False
 
 
@@ -212,21 +291,23 @@ async def main():
     print("  • KM2100 (192.168.1.131)")
     print()
     
+    session = make_session()
+    device_manager = None
     try:
         # Test 1: Basic connectivity
-        connectivity_results = await test_basic_connectivity()
+        connectivity_results = await test_basic_connectivity(session)
         
         # Test 2: SNMP discovery
         discovered_devices = await test_snmp_discovery()
         
         # Test 3: Device authentication
-        await test_individual_device_connections()
+        await test_individual_device_connections(session)
         
         # Test 4: Device manager
-        managed_devices = await test_device_manager()
+        device_manager, managed_devices = await test_device_manager()
         
         # Test 5: Middleware startup
-        startup_success = await test_middleware_startup()
+        startup_success = await test_middleware_startup(device_manager, managed_devices)
         
         # Summary
         print("📊 TEST SUMMARY")
@@ -253,9 +334,11 @@ async def main():
             print("Check the error messages above for troubleshooting guidance.")
         
     except Exception as e:
-        print(f"❌ TESTING FAILED: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ TESTING FAILED: {e}")
+    finally:
+        if device_manager is not None:
+            await device_manager.stop()
+        await session.close()
 
 
 if __name__ == "__main__":
@@ -4,7 +4,7 @@ Test script to validate your specific machine configuration.
 """
 
 import asyncio
-from src.konika_middleware.models.config import Settings
+from src.konika_middleware.models.config import get_settings
 from src.konika_middleware.core.device_manager import DeviceManager
 
 
@@ -14,7 +14,7 @@ async def test_your_configuration():
     print("=" * 60)
     
     # Load settings from .env file
-    settings = Settings()
+    settings = get_settings()
     
     print(f"AUTO_DISCOVER: {settings.auto_discover}")
     print(f"MACHINE_LIST: {settings.machine_list}")